@@ -1,15 +1,19 @@
 import functools
 import sys
+import threading
 import traceback
 from contextlib import contextmanager
 from types import TracebackType
 
 import pytest
-from pytestqt.utils import get_marker
 
 CapturedException = tuple[type[BaseException], BaseException, TracebackType]
 CapturedExceptions = list[CapturedException]
 
+# maximum number of distinct exceptions stored by a deferred
+# _QtExceptionCaptureManager, further exceptions are only counted
+MAX_DEFERRED_EXCEPTIONS = 10
+
 
 @contextmanager
 def capture_exceptions():
@@ -26,27 +30,139 @@ def capture_exceptions():
         manager.finish()
 
 
-def _except_hook(type_, value, tback, exceptions=None):
+def _except_hook(type_, value, tback, exceptions=None, on_exception=None, origin=None):
     """Hook functions installed by _QtExceptionCaptureManager"""
+    if origin is None:
+        origin = _get_thread_origin()
     exceptions.append((type_, value, tback))
+    if origin is not None:
+        sys.stderr.write(f"{origin}:\n")
     sys.stderr.write(format_captured_exceptions([(type_, value, tback)]))
+    if on_exception is not None:
+        on_exception()
+
+
+def _get_thread_origin():
+    """
+    Describes the current thread as the origin of an exception, or returns None
+    for the main thread.
+    """
+    thread = threading.current_thread()
+    if thread is threading.main_thread():
+        return None
+    return f"Exception in thread {thread.name!r}"
 
 
 class _QtExceptionCaptureManager:
     """
     Manages exception capture context.
+
+    :ivar bool fail_fast: if waits in progress (``qtbot.waitSignal``, ``qtbot.waitUntil``,
+        etc.) should be aborted as soon as an exception is captured, failing the test
+        right away instead of after the wait times out.
+    :ivar str when: test phase (``"SETUP"``, ``"CALL"`` or ``"TEARDOWN"``) reported when
+        failing the test because of a ``fail_fast`` abort.
+    :ivar bool deferred: if True, exceptions are stored as ``TracebackException``
+        snapshots which don't keep the frames alive, identical exceptions are only
+        stored once with their count, at most ``MAX_DEFERRED_EXCEPTIONS`` distinct
+        exceptions are stored, and tracebacks are only formatted when failing the
+        test. Otherwise, ``exceptions`` contains ``(type, value, traceback)`` tuples
+        and each exception is written to ``sys.stderr`` as it is captured.
     """
 
-    def __init__(self):
+    def __init__(self, fail_fast=False, deferred=False):
         self.old_hook = None
+        self.old_threading_hook = None
+        self.old_unraisable_hook = None
+        self._hook = None
         self.exceptions = []
+        self.fail_fast = fail_fast
+        self.when = "CALL"
+        self.deferred = deferred
+        self._exception_indexes = {}
+        self._exception_counts = []
+        self._exception_origins = []
+        self._omitted_exceptions = 0
 
     def start(self):
         """Start exception capturing by installing a hook into sys.excepthook
         that records exceptions received into ``self.exceptions``.
+
+        Exceptions which are not handled in threads (``threading.excepthook``) and
+        unraisable exceptions (``sys.unraisablehook``) are also captured.
         """
+        on_exception = self._abort_waits if self.fail_fast else None
+        if self.deferred:
+            self._hook = functools.partial(
+                self._deferred_except_hook, on_exception=on_exception
+            )
+        else:
+            self._hook = functools.partial(
+                _except_hook, exceptions=self.exceptions, on_exception=on_exception
+            )
         self.old_hook = sys.excepthook
-        sys.excepthook = functools.partial(_except_hook, exceptions=self.exceptions)
+        self.old_threading_hook = threading.excepthook
+        self.old_unraisable_hook = sys.unraisablehook
+        sys.excepthook = self._hook
+        threading.excepthook = self._threading_except_hook
+        sys.unraisablehook = self._unraisable_hook
+
+    def _threading_except_hook(self, args):
+        """Hook installed into ``threading.excepthook``."""
+        if args.exc_type is SystemExit:
+            # silently ignored by the default hook too
+            return
+        name = args.thread.name if args.thread is not None else "<unknown>"
+        self._hook(
+            args.exc_type,
+            args.exc_value,
+            args.exc_traceback,
+            origin=f"Exception in thread {name!r}",
+        )
+
+    def _unraisable_hook(self, unraisable):
+        """Hook installed into ``sys.unraisablehook``."""
+        origin = unraisable.err_msg or "Exception ignored in"
+        if unraisable.object is not None:
+            try:
+                origin += f": {unraisable.object!r}"
+            except Exception:
+                origin += ": <object repr() failed>"
+        thread_origin = _get_thread_origin()
+        if thread_origin is not None:
+            origin = f"{thread_origin}, {origin[0].lower()}{origin[1:]}"
+        self._hook(
+            unraisable.exc_type,
+            unraisable.exc_value,
+            unraisable.exc_traceback,
+            origin=origin,
+        )
+
+    def _deferred_except_hook(
+        self, type_, value, tback, on_exception=None, origin=None
+    ):
+        """Hook installed when ``deferred`` is True."""
+        if origin is None:
+            origin = _get_thread_origin()
+        key = (
+            type_,
+            str(value),
+            tuple((frame.f_code, lineno) for frame, lineno in traceback.walk_tb(tback)),
+        )
+        index = self._exception_indexes.get(key)
+        if index is not None:
+            self._exception_counts[index] += 1
+        elif len(self.exceptions) < MAX_DEFERRED_EXCEPTIONS:
+            self._exception_indexes[key] = len(self.exceptions)
+            self.exceptions.append(
+                traceback.TracebackException(type_, value, tback, lookup_lines=False)
+            )
+            self._exception_counts.append(1)
+            self._exception_origins.append(origin)
+        else:
+            self._omitted_exceptions += 1
+        if on_exception is not None:
+            on_exception()
 
     def finish(self):
         """Stop exception capturing, restoring the original hook.
@@ -55,7 +171,21 @@ class _QtExceptionCaptureManager:
         """
         if self.old_hook is not None:
             sys.excepthook = self.old_hook
+            threading.excepthook = self.old_threading_hook
+            sys.unraisablehook = self.old_unraisable_hook
             self.old_hook = None
+            self.old_threading_hook = None
+            self.old_unraisable_hook = None
+            if self.fail_fast:
+                from pytestqt.wait_signal import _clear_pending_abort
+
+                _clear_pending_abort()
+
+    def _abort_waits(self):
+        """Abort the waits in progress, failing the test with the captured exceptions."""
+        from pytestqt.wait_signal import _abort_waits
+
+        _abort_waits(lambda: self.fail_if_exceptions_occurred(self.when))
 
     def fail_if_exceptions_occurred(self, when):
         """calls pytest.fail() with an informative message if exceptions
@@ -67,12 +197,43 @@ class _QtExceptionCaptureManager:
             exceptions = self.exceptions
             self.exceptions = []
             prefix = "%s ERROR: " % when
-            msg = prefix + format_captured_exceptions(exceptions)
+            if self.deferred:
+                msg = prefix + self._format_deferred_exceptions(exceptions)
+                self._exception_indexes.clear()
+                self._exception_counts = []
+                self._exception_origins = []
+                self._omitted_exceptions = 0
+            else:
+                msg = prefix + format_captured_exceptions(exceptions)
             del exceptions[:]  # Don't keep exceptions alive longer.
             if hasattr(sys, "last_exc"):
                 sys.last_exc = None
             pytest.fail(msg, pytrace=False)
 
+    def _format_deferred_exceptions(self, exceptions):
+        """
+        Formats the ``TracebackException`` instances captured by the deferred hook,
+        like ``format_captured_exceptions``.
+        """
+        from io import StringIO
+
+        stream = StringIO()
+        stream.write("Exceptions caught in Qt event loop:\n")
+        sep = "_" * 80 + "\n"
+        stream.write(sep)
+        for exc, count, origin in zip(
+            exceptions, self._exception_counts, self._exception_origins
+        ):
+            if origin is not None:
+                stream.write(f"{origin}:\n")
+            stream.writelines(exc.format())
+            if count > 1:
+                stream.write(f"(raised {count} times)\n")
+            stream.write(sep)
+        if self._omitted_exceptions:
+            stream.write(f"{self._omitted_exceptions} more exceptions not shown\n")
+        return stream.getvalue()
+
 
 def format_captured_exceptions(exceptions):
     """
@@ -91,14 +252,6 @@ def format_captured_exceptions(exceptions):
     return stream.getvalue()
 
 
-def _is_exception_capture_enabled(item):
-    """returns if exception capture is disabled for the given test item."""
-    disabled = get_marker(item, "qt_no_exception_capture") or item.config.getini(
-        "qt_no_exception_capture"
-    )
-    return not disabled
-
-
 class TimeoutError(Exception):
     """
     .. versionadded:: 2.1
@@ -0,0 +1,156 @@
+from collections.abc import Callable
+import dataclasses
+
+import pytest
+
+from pytestqt.utils import get_marker
+
+# fixtures making a test use Qt, for the qt_only_qt_tests ini option
+_QT_FIXTURES = frozenset(["qapp", "qtbot", "qtlog", "qtmodeltester"])
+
+# values of the qt_event_drain ini option, the first one being the default
+EVENT_DRAIN_OPTIONS = ["single", "until-idle", "none"]
+
+
+@dataclasses.dataclass(frozen=True)
+class QtItemConfig:
+    """
+    Configuration of pytest-qt for a test item, resolved once from the ini options
+    and the marks of the item, so the hooks and ``QtBot`` don't need to look them up
+    again.
+    """
+
+    #: if the per-test Qt machinery runs for this item (see ``qt_only_qt_tests``).
+    enabled: bool
+    #: if exceptions are captured (see ``qt_no_exception_capture``).
+    exception_capture: bool
+    #: default value of the ``raising`` parameter of ``qtbot.waitSignal`` and friends.
+    default_raising: bool
+    #: maximum time in ms spent deleting the registered widgets after the test.
+    teardown_timeout: int
+    #: if the number of deleted widgets is recorded in the user properties.
+    record_deleted_widgets: bool
+    #: how pending events are processed around the test (see ``qt_event_drain``).
+    event_drain: str
+    #: maximum number of ``processEvents()`` calls of an ``until-idle`` drain.
+    event_drain_max_iterations: int
+    #: maximum time in ms spent by an ``until-idle`` drain.
+    event_drain_timeout: int
+    #: if Qt messages are captured (see the ``no_qt_log`` mark).
+    log_capture: bool
+    #: regexes of the Qt messages which don't make the test fail.
+    log_ignore_regexes: tuple[str, ...]
+    #: checks if a message matches any of ``log_ignore_regexes``.
+    log_is_ignored: Callable[[str], bool]
+    #: least severe level of the Qt messages which make the test fail.
+    log_fail_level: str
+    #: least severe level of the captured Qt messages.
+    log_capture_level: str
+    #: if a failing Qt message fails the test immediately.
+    log_fail_fast: bool
+
+    @classmethod
+    def from_item(cls, item: pytest.Item) -> "QtItemConfig":
+        # imported here because these modules use the item configuration themselves
+        from pytestqt.logging import QtLoggingPlugin, _compile_ignore_regexes
+        from pytestqt.qtbot import _parse_ini_boolean
+
+        config = item.config
+
+        if _parse_ini_boolean(config.getini("qt_only_qt_tests") or False):
+            fixturenames = getattr(item, "fixturenames", ())
+            enabled = bool(_QT_FIXTURES.intersection(fixturenames)) or bool(
+                get_marker(item, "qt")
+            )
+        else:
+            enabled = True
+
+        exception_capture = not (
+            get_marker(item, "qt_no_exception_capture")
+            or config.getini("qt_no_exception_capture")
+        )
+
+        default_raising = config.getini("qt_default_raising")
+        default_raising = (
+            _parse_ini_boolean(default_raising) if default_raising else True
+        )
+
+        event_drain = config.getini("qt_event_drain") or EVENT_DRAIN_OPTIONS[0]
+        if event_drain not in EVENT_DRAIN_OPTIONS:
+            raise ValueError(
+                f"Invalid value for qt_event_drain: {event_drain!r}, "
+                f"expected one of {EVENT_DRAIN_OPTIONS}"
+            )
+
+        m = get_marker(item, "qt_log_ignore")
+        if m:
+            if not set(m.kwargs).issubset({"extend"}):
+                raise ValueError(
+                    "Invalid keyword arguments in {!r} for "
+                    "qt_log_ignore mark.".format(m.kwargs)
+                )
+            if m.kwargs.get("extend", True):
+                log_ignore_regexes = config.getini("qt_log_ignore") + list(m.args)
+            else:
+                log_ignore_regexes = m.args
+        else:
+            log_ignore_regexes = config.getini("qt_log_ignore")
+        log_ignore_regexes = tuple(log_ignore_regexes)
+
+        m = get_marker(item, "qt_log_level_fail")
+        if m:
+            log_fail_level = m.args[0]
+        else:
+            log_fail_level = config.getini("qt_log_level_fail")
+        assert log_fail_level in QtLoggingPlugin.LOG_FAIL_OPTIONS
+
+        m = get_marker(item, "qt_log_capture_level")
+        if m:
+            log_capture_level = m.args[0]
+        else:
+            log_capture_level = config.getini("qt_log_capture_level")
+        assert log_capture_level in QtLoggingPlugin.LOG_CAPTURE_OPTIONS
+
+        m = get_marker(item, "qt_log_fail_fast")
+        if m:
+            log_fail_fast = m.args[0] if m.args else True
+        else:
+            log_fail_fast = _parse_ini_boolean(
+                config.getini("qt_log_fail_fast") or False
+            )
+
+        return cls(
+            enabled=enabled,
+            exception_capture=exception_capture,
+            default_raising=default_raising,
+            teardown_timeout=int(config.getini("qt_teardown_timeout") or 1000),
+            record_deleted_widgets=_parse_ini_boolean(
+                config.getini("qt_record_deleted_widgets") or False
+            ),
+            event_drain=event_drain,
+            event_drain_max_iterations=int(
+                config.getini("qt_event_drain_max_iterations") or 100
+            ),
+            event_drain_timeout=int(config.getini("qt_event_drain_timeout") or 1000),
+            log_capture=not get_marker(item, "no_qt_log"),
+            log_ignore_regexes=log_ignore_regexes,
+            log_is_ignored=_compile_ignore_regexes(log_ignore_regexes),
+            log_fail_level=log_fail_level,
+            log_capture_level=log_capture_level,
+            log_fail_fast=log_fail_fast,
+        )
+
+
+def get_item_config(item: pytest.Item) -> QtItemConfig:
+    """
+    Returns the configuration of the given item, which is usually resolved during
+    collection (see ``pytest_collection_modifyitems``), and resolved again when marks
+    were applied to the item since then (e.g. with ``request.applymarker`` in a fixture).
+    """
+    marker_count = len(item.own_markers)
+    item_config = getattr(item, "qt_item_config", None)
+    if item_config is None or item.qt_item_config_markers != marker_count:  # type: ignore[attr-defined]
+        item_config = QtItemConfig.from_item(item)
+        item.qt_item_config = item_config  # type: ignore[attr-defined]
+        item.qt_item_config_markers = marker_count  # type: ignore[attr-defined]
+    return item_config
@@ -1,11 +1,22 @@
-from collections import namedtuple
+from collections import Counter, deque, namedtuple
 from contextlib import contextmanager
 import datetime
+import functools
+import itertools
+import json
+import operator
+import os
+import queue
 import re
+import sys
+import threading
+import time
 from _pytest._code.code import TerminalRepr, ReprFileLocation
 import pytest
 from pytestqt.qt_compat import qt_api
-from pytestqt.utils import get_marker
+from pytestqt.exceptions import TimeoutError
+from pytestqt.item_config import get_item_config
+from pytestqt.wait_signal import CallbackBlocker
 
 
 class QtLoggingPlugin:
@@ -15,29 +26,115 @@ class QtLoggingPlugin:
     """
 
     LOG_FAIL_OPTIONS = ["NO", "CRITICAL", "WARNING", "DEBUG", "INFO"]
+    LOG_CAPTURE_OPTIONS = ["INFO", "DEBUG", "WARNING", "CRITICAL"]
 
     def __init__(self, config):
         self.config = config
+        log_file = _get_log_file_path(config)
+        self._log_file_writer = (
+            _QtLogFileWriter(log_file) if log_file is not None else None
+        )
+        self._summary_size = config.getoption("qt_log_summary")
+        self._statistics = _QtLogStatistics() if self._summary_size > 0 else None
+
+        log_format = config.getoption("qt_log_format")
+        self._format_context = None
+        if log_format is None:
+            self._format_context = (
+                "{rec.context.file}:{rec.context.function}:{rec.context.line}:\n".format
+            )
+            log_format = "    {rec.type_name}: {rec.message}"
+        self._format_record = log_format.format
+        self._format_record_without_context = log_format.lstrip().format
+        self._report_max_messages = int(
+            config.getini("qt_log_report_max_messages") or 0
+        )
+        self._max_records = int(config.getini("qt_log_max_records") or 0) or None
+
+    def pytest_unconfigure(self, config):
+        if self._log_file_writer is not None:
+            self._log_file_writer.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Show the statistics of the captured messages (see ``--qt-log-summary``)."""
+        if self._statistics is not None:
+            self._statistics.write_summary(terminalreporter, self._summary_size)
 
     def pytest_runtest_setup(self, item):
-        if get_marker(item, "no_qt_log"):
+        item_config = get_item_config(item)
+        if not item_config.enabled or not item_config.log_capture:
             return
-        m = get_marker(item, "qt_log_ignore")
-        if m:
-            if not set(m.kwargs).issubset({"extend"}):
-                raise ValueError(
-                    "Invalid keyword arguments in {!r} for "
-                    "qt_log_ignore mark.".format(m.kwargs)
+        item.qt_log_capture = _QtMessageCapture(
+            item_config.log_ignore_regexes,
+            log_fail_level=item_config.log_fail_level,
+            fail_fast=item_config.log_fail_fast,
+            capture_level=item_config.log_capture_level,
+            max_records=self._max_records,
+            log_file_writer=self._log_file_writer,
+            statistics=self._statistics,
+            nodeid=item.nodeid,
+            is_ignored=item_config.log_is_ignored,
+        )
+        item.qt_log_capture._start()
+
+    def _format_records(self, capture):
+        """
+        Return the lines of the "Captured Qt messages" report section for the
+        records of the given capture.
+
+        Consecutive identical messages are shown once, with their count, and only
+        the first and last ``qt_log_report_max_messages`` messages are shown.
+        """
+        # None marks where the records dropped because of qt_log_max_records were
+        groups = _group_records(
+            itertools.chain(capture._records, [None], capture._tail)
+        )
+        omitted = 0
+        max_messages = self._report_max_messages
+        if max_messages and len(groups) > max_messages + 1:
+            # a single marker shows both the dropped and omitted messages
+            groups = [group for group in groups if group[0] is not None]
+            head_size = max_messages // 2
+            tail_size = max_messages - head_size
+            tail_start = len(groups) - tail_size
+            omitted = sum(count for rec, count in groups[head_size:tail_start])
+            groups = groups[:head_size] + [(None, 0)] + groups[tail_start:]
+
+        lines = []
+        for rec, count in groups:
+            if rec is None:
+                dropped_counts = capture.dropped_counts
+                if dropped_counts:
+                    counts = ", ".join(
+                        f"{level}: {count}" for level, count in dropped_counts.items()
+                    )
+                    lines.append(
+                        f"... {sum(dropped_counts.values())} messages "
+                        f"dropped ({counts}) ..."
+                    )
+                if omitted:
+                    lines.append(f"... {omitted} messages omitted ...")
+                continue
+
+            suffix = " (IGNORED)" if rec.ignored else ""
+            if count > 1:
+                suffix += f" (x{count})"
+
+            if (
+                rec.context is not None
+                and (
+                    rec.context.file is not None
+                    or rec.context.function is not None
+                    or rec.context.line != 0
                 )
-            if m.kwargs.get("extend", True):
-                config_regexes = self.config.getini("qt_log_ignore")
-                ignore_regexes = config_regexes + list(m.args)
+                and self._format_context is not None
+            ):
+                lines.append(self._format_context(rec=rec))
+                line = self._format_record(rec=rec)
             else:
-                ignore_regexes = m.args
-        else:
-            ignore_regexes = self.config.getini("qt_log_ignore")
-        item.qt_log_capture = _QtMessageCapture(ignore_regexes)
-        item.qt_log_capture._start()
+                line = self._format_record_without_context(rec=rec)
+            lines.append(line + suffix)
+        return lines
 
     @pytest.hookimpl(wrapper=True)
     def pytest_runtest_makereport(self, item, call):
@@ -46,26 +143,29 @@ class QtLoggingPlugin:
         if not hasattr(item, "qt_log_capture"):
             return report
 
-        if call.when == "call":
-            m = get_marker(item, "qt_log_level_fail")
-            if m:
-                log_fail_level = m.args[0]
+        if call.when in ("setup", "call"):
+            # marks applied by fixtures or by the test itself
+            try:
+                log_fail_level = get_item_config(item).log_fail_level
+            except (ValueError, AssertionError):
+                # reported when setting up the item
+                pass
             else:
-                log_fail_level = self.config.getini("qt_log_level_fail")
-            assert log_fail_level in QtLoggingPlugin.LOG_FAIL_OPTIONS
+                item.qt_log_capture._set_log_fail_level(log_fail_level)
+
+        if call.when == "call":
+            item.qt_log_capture._flush_thread_buffers()
+            log_fail_level = item.qt_log_capture.log_fail_level
 
             # make test fail if any records were captured which match
             # log_fail_level
             if report.outcome != "failed":
-                for rec in item.qt_log_capture.records:
-                    is_modeltest_error = (
-                        rec.context is not None
-                        and rec.context.category == "qt.modeltest"
-                        and rec.matches_level("WARNING")
-                    )
-                    if (
-                        rec.matches_level(log_fail_level) and not rec.ignored
-                    ) or is_modeltest_error:
+                for rec in itertools.chain(
+                    item.qt_log_capture.iter_records(),
+                    item.qt_log_capture._dropped_failures,
+                ):
+                    is_modeltest_error = _is_modeltest_error(rec)
+                    if _is_failure_record(rec, log_fail_level):
                         report.outcome = "failed"
                         if report.longrepr is None:
                             report.longrepr = _QtLogLevelErrorRepr(
@@ -78,32 +178,7 @@ class QtLoggingPlugin:
             if not report.passed:
                 long_repr = getattr(report, "longrepr", None)
                 if hasattr(long_repr, "addsection"):  # pragma: no cover
-                    log_format = self.config.getoption("qt_log_format")
-                    context_format = None
-                    if log_format is None:
-                        context_format = "{rec.context.file}:{rec.context.function}:{rec.context.line}:\n"
-                        log_format = "    {rec.type_name}: {rec.message}"
-
-                    lines = []
-                    for rec in item.qt_log_capture.records:
-                        suffix = " (IGNORED)" if rec.ignored else ""
-
-                        if (
-                            rec.context is not None
-                            and (
-                                rec.context.file is not None
-                                or rec.context.function is not None
-                                or rec.context.line != 0
-                            )
-                            and context_format is not None
-                        ):
-                            context_line = context_format.format(rec=rec)
-                            lines.append(context_line)
-                        else:
-                            log_format = log_format.lstrip()
-
-                        line = log_format.format(rec=rec) + suffix
-                        lines.append(line)
+                    lines = self._format_records(item.qt_log_capture)
                     if lines:
                         long_repr.addsection("Captured Qt messages", "\n".join(lines))
 
@@ -112,20 +187,177 @@ class QtLoggingPlugin:
         return report
 
 
+def _is_modeltest_error(rec):
+    """Messages emitted by the model tester make tests fail regardless of the fail level."""
+    return (
+        rec.context is not None
+        and rec.context.category == "qt.modeltest"
+        and rec.matches_level("WARNING")
+    )
+
+
+def _is_failure_record(rec, log_fail_level):
+    """Returns True if the given record should make the test fail."""
+    return (
+        rec.matches_level(log_fail_level) and not rec.ignored
+    ) or _is_modeltest_error(rec)
+
+
+# backreferences and conditional group references are numbered/named per pattern,
+# so patterns using them can't be merged with other patterns into a single regex
+_BACKREFERENCE_RE = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_ignore_regexes(regexes):
+    """
+    Returns a callable which checks if a message matches any of the given regexes
+    (a tuple of strings).
+
+    The regexes are compiled once for each distinct configuration and merged into
+    a single alternation where possible, so each message is searched only once
+    regardless of the number of patterns.
+    """
+    compiled = [re.compile(regex) for regex in regexes]
+    if not compiled:
+        return lambda message: False
+
+    mergeable = [c for c in compiled if _BACKREFERENCE_RE.search(c.pattern) is None]
+    separate = [c for c in compiled if c not in mergeable]
+    if len(mergeable) > 1:
+        try:
+            merged = re.compile("|".join(f"(?:{c.pattern})" for c in mergeable))
+        except re.error:
+            # e.g. global inline flags such as "(?i)" which are only allowed
+            # at the start of a pattern
+            separate = compiled
+        else:
+            separate.insert(0, merged)
+    else:
+        separate = compiled
+
+    if len(separate) == 1:
+        search = separate[0].search
+        return lambda message: search(message) is not None
+    return lambda message: any(c.search(message) is not None for c in separate)
+
+
+def _pop_all(buffer):
+    """
+    Pops all the messages of a thread buffer, which might be emptied by its thread
+    at the same time (see ``_QtMessageCapture._handle_with_context``).
+    """
+    while True:
+        try:
+            yield buffer.popleft()
+        except IndexError:
+            return
+
+
+def _to_unicode(s):
+    if isinstance(s, bytes):
+        s = s.decode("utf-8", "replace")
+    return s
+
+
+def _intern(s):
+    s = _to_unicode(s)
+    return s if s is None else sys.intern(s)
+
+
 class _QtMessageCapture:
     """
     Captures Qt messages when its `handle` method is installed using
     qInstallMessageHandler, and stores them into `records` attribute.
 
-    :attr _records: list of Record instances.
+    :attr _records: list of Record instances; when ``max_records`` is given, only
+        the first records are kept here, the last ones being kept in ``_tail``.
+    :attr _tail: deque with the most recent Record instances, when ``max_records``
+        is given.
     :attr _ignore_regexes: list of regexes (as strings) that define if a record
         should be ignored.
+    :attr _is_ignored: callable returning True if a message matches any of
+        ``_ignore_regexes`` (see ``_compile_ignore_regexes``).
+    :attr log_fail_level: level (one of ``QtLoggingPlugin.LOG_FAIL_OPTIONS``) of
+        messages which make the test fail.
+    :attr _fail_fast: if True, waits in progress are aborted and the test fails as
+        soon as a message making the test fail is captured.
+    :attr capture_level: level (one of ``QtLoggingPlugin.LOG_CAPTURE_OPTIONS``) of
+        the least severe messages which are captured; messages below it are dropped,
+        unless they would make the test fail.
+    :attr _max_records: maximum number of records kept, or None for no limit.
+    :attr _dropped_counts: number of records dropped because of ``_max_records``,
+        by level name.
+    :attr _dropped_failures: list with the first dropped record which makes the
+        test fail, if any.
+    :attr _indices: tuple with the records indexed by level name and by category,
+        built on first use by ``by_level``, ``by_category`` and ``count``. Each index
+        maps a key to a ``(head, tail)`` tuple, mirroring ``_records`` and ``_tail``.
+    :attr _log_file_writer: ``_QtLogFileWriter`` to which all the records are
+        written, or None.
+    :attr _statistics: ``_QtLogStatistics`` counting all the records, or None.
+    :attr _nodeid: node id of the test, written with the records to
+        ``_log_file_writer`` and counted in ``_statistics``.
+    :attr _thread_buffers: dict mapping the ids of threads other than the main
+        thread to deques with the raw messages they emitted, which are only
+        stored by ``_flush_thread_buffers`` on the main thread.
+    :attr _message_waiters: list of ``(pattern, CallbackBlocker)`` tuples of the
+        ``waitForMessage`` calls in progress.
     """
 
-    def __init__(self, ignore_regexes):
+    def __init__(
+        self,
+        ignore_regexes,
+        log_fail_level="NO",
+        fail_fast=False,
+        capture_level="INFO",
+        max_records=None,
+        log_file_writer=None,
+        statistics=None,
+        nodeid=None,
+        is_ignored=None,
+    ):
         self._records = []
+        self._max_records = max_records
+        if max_records is None:
+            self._head_size = None
+            self._tail = deque()
+        else:
+            self._head_size = max_records // 2
+            self._tail = deque(maxlen=max_records - self._head_size)
+        self._dropped_counts = {}
+        self._dropped_failures = []
+        self._indices = None
+        self._message_waiters = []
+        self._log_file_writer = log_file_writer
+        self._statistics = statistics
+        self._nodeid = nodeid
+        self._start_ns = time.monotonic_ns()
         self._ignore_regexes = ignore_regexes or []
+        if is_ignored is None:
+            is_ignored = _compile_ignore_regexes(tuple(self._ignore_regexes))
+        self._is_ignored = is_ignored
         self._previous_handler = None
+        self._fail_fast = fail_fast
+        self._failed_fast = False
+        self._contexts = {}
+        self.capture_level = capture_level
+        self._set_log_fail_level(log_fail_level)
+        self._main_thread_id = threading.get_ident()
+        self._thread_buffers = {}
+        self._thread_buffers_pending = False
+        self._severities = _get_severities()
+
+    def _set_log_fail_level(self, log_fail_level):
+        """
+        Changes the level of the messages which make the test fail, e.g. when a
+        ``qt_log_level_fail`` mark is applied by a fixture.
+        """
+        self.log_fail_level = log_fail_level
+        self._min_severity = _LEVEL_THRESHOLDS[self.capture_level]
+        self._fail_severity = _LEVEL_THRESHOLDS[log_fail_level]
+        if self._fail_severity is not None:
+            self._min_severity = min(self._min_severity, self._fail_severity)
 
     def _start(self):
         """
@@ -142,6 +374,11 @@ class _QtMessageCapture:
         handler.
         """
         qt_api.QtCore.qInstallMessageHandler(self._previous_handler)
+        self._flush_thread_buffers()
+        if self._failed_fast:
+            from pytestqt.wait_signal import _clear_pending_abort
+
+            _clear_pending_abort()
 
     @contextmanager
     def disabled(self):
@@ -157,52 +394,335 @@ class _QtMessageCapture:
 
     _Context = namedtuple("_Context", "file function line category")
 
-    def _append_new_record(self, msg_type, message, context):
+    def _append_new_record(self, msg_type, message, context, timestamp_ns=None):
         """
         Creates a new Record instance and stores it.
 
         :param msg_type: Qt message typ
         :param message: message string, if bytes it will be converted to str.
         :param context: QMessageLogContext object or None
+        :param timestamp_ns: when the message was emitted, defaults to now.
         """
 
-        def to_unicode(s):
-            if isinstance(s, bytes):
-                s = s.decode("utf-8", "replace")
-            return s
-
-        message = to_unicode(message)
-
-        ignored = False
-        for regex in self._ignore_regexes:
-            if re.search(regex, message) is not None:
-                ignored = True
-                break
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        message = _to_unicode(message)
+        ignored = self._is_ignored(message)
 
         if context is not None:
+            context = self._get_context(
+                context.file, context.function, context.line, context.category
+            )
+
+        record = Record(msg_type, message, ignored, context, timestamp_ns)
+        self._store(record)
+        if self._statistics is not None:
+            self._statistics.add(self._nodeid, record)
+        if self._log_file_writer is not None:
+            self._log_file_writer.write(
+                self._nodeid, record, (timestamp_ns - self._start_ns) / 1e6
+            )
+        if (
+            self._fail_fast
+            and not self._failed_fast
+            and _is_failure_record(record, self.log_fail_level)
+        ):
+            self._abort_waits(record)
+
+    def _store(self, record):
+        """
+        Stores the given record, dropping the oldest record after the first
+        ``_max_records // 2`` ones if ``_max_records`` is reached.
+        """
+        indices = self._indices
+        if self._head_size is None or len(self._records) < self._head_size:
+            self._records.append(record)
+            if indices is not None:
+                for index, key in zip(indices, self._index_keys(record)):
+                    index.setdefault(key, ([], deque()))[0].append(record)
+        else:
+            tail = self._tail
+            if len(tail) == tail.maxlen:
+                dropped = tail.popleft()
+                if indices is not None:
+                    # the dropped record is the oldest record of the tail, so
+                    # it's also the oldest record in the tail of its index entries
+                    for index, key in zip(indices, self._index_keys(dropped)):
+                        index[key][1].popleft()
+                self._drop(dropped)
+            tail.append(record)
+            if indices is not None:
+                for index, key in zip(indices, self._index_keys(record)):
+                    index.setdefault(key, ([], deque()))[1].append(record)
+
+        for pattern, blocker in self._message_waiters:
+            if not blocker.called and pattern.search(record.message):
+                blocker(record)
+
+    @staticmethod
+    def _index_keys(record):
+        context = record.context
+        return record.log_type_name, None if context is None else context.category
+
+    def _get_indices(self):
+        self._flush_thread_buffers()
+        if self._indices is None:
+            indices = ({}, {})
+            for part, records in enumerate((self._records, self._tail)):
+                for record in records:
+                    for index, key in zip(indices, self._index_keys(record)):
+                        index.setdefault(key, ([], deque()))[part].append(record)
+            self._indices = indices
+        return self._indices
+
+    def _drop(self, record):
+        level = record.log_type_name
+        self._dropped_counts[level] = self._dropped_counts.get(level, 0) + 1
+        if not self._dropped_failures and _is_failure_record(
+            record, self.log_fail_level
+        ):
+            self._dropped_failures.append(record)
+
+    def _get_context(self, file, function, line, category):
+        """
+        Return a ``_Context`` for the given message location, sharing the same
+        instance (and interned strings) between all messages emitted from it.
+        """
+        key = (file, function, line, category)
+        context = self._contexts.get(key)
+        if context is None:
             context = self._Context(
-                to_unicode(context.file),
-                to_unicode(context.function),
-                context.line,
-                to_unicode(context.category),
+                _intern(file), _intern(function), line, _intern(category)
             )
+            self._contexts[key] = context
+        return context
 
-        self._records.append(Record(msg_type, message, ignored, context))
+    def _abort_waits(self, record):
+        """
+        Aborts the waits in progress (see ``qt_log_fail_fast``), failing the test
+        because of the given record.
+        """
+        from pytestqt.wait_signal import _abort_waits
+
+        self._failed_fast = True
+        if _is_modeltest_error(record):
+            msg = "Qt modeltester errors"
+        else:
+            msg = f"Failure: Qt messages with level {self.log_fail_level} or above emitted"
+        msg += f"\n{record.type_name}: {record.message}"
+        _abort_waits(lambda: pytest.fail(msg, pytrace=False))
 
     def _handle_with_context(self, msg_type, context, message):
         """
         Method to be installed using qInstallMessageHandler,
         stores each message into the `_records` attribute.
         """
+        severity = self._severities[msg_type]
+        if severity < self._min_severity and not (
+            severity == _SEVERITY_WARNING
+            and context is not None
+            and _to_unicode(context.category) == "qt.modeltest"
+        ):
+            return
+        in_main_thread = threading.get_ident() == self._main_thread_id
+        if not in_main_thread and not (
+            self._message_waiters
+            or (self._fail_severity is not None and severity >= self._fail_severity)
+        ):
+            # messages from other threads are only buffered, to avoid contention
+            # with the main thread, unless they must be handled right away
+            if context is not None:
+                context = self._Context(
+                    context.file, context.function, context.line, context.category
+                )
+            buffer = self._thread_buffers.get(threading.get_ident())
+            if buffer is None:
+                buffer = self._thread_buffers[threading.get_ident()] = deque()
+            buffer.append((time.monotonic_ns(), msg_type, message, context))
+            self._thread_buffers_pending = True
+            return
+        if in_main_thread:
+            if self._thread_buffers_pending:
+                self._flush_thread_buffers()
+        else:
+            # only the main thread empties the buffers of the other threads, the
+            # direct path of another thread just stores its own earlier messages
+            # first, so they are kept in order
+            buffer = self._thread_buffers.get(threading.get_ident())
+            if buffer:
+                for timestamp_ns, msg_type_, message_, context_ in _pop_all(buffer):
+                    self._append_new_record(msg_type_, message_, context_, timestamp_ns)
         self._append_new_record(msg_type, message, context=context)
 
+    def _flush_thread_buffers(self):
+        """
+        Stores the messages buffered by other threads, in the order they were
+        emitted. Must be called from the main thread.
+        """
+        if not self._thread_buffers_pending:
+            return
+        self._thread_buffers_pending = False
+        pending = []
+        for buffer in list(self._thread_buffers.values()):
+            pending.extend(_pop_all(buffer))
+        pending.sort(key=lambda item: item[0])
+        for timestamp_ns, msg_type, message, context in pending:
+            self._append_new_record(msg_type, message, context, timestamp_ns)
+
     @property
     def records(self):
         """Access messages captured so far.
 
         :rtype: list of `Record` instances.
         """
-        return self._records[:]
+        return list(self.iter_records())
+
+    def iter_records(self):
+        """Iterate over the messages captured so far, without copying them.
+
+        .. versionadded:: 4.6
+
+        :rtype: iterator of `Record` instances.
+        """
+        self._flush_thread_buffers()
+        return itertools.chain(self._records, self._tail)
+
+    def by_level(self, level):
+        """Messages captured so far with the given level name (``"DEBUG"``,
+        ``"WARNING"``, ...).
+
+        .. versionadded:: 4.6
+
+        :rtype: list of `Record` instances.
+        """
+        head, tail = self._get_indices()[0].get(level, ((), ()))
+        return [*head, *tail]
+
+    def by_category(self, category):
+        """Messages captured so far with the given logging category (for example
+        ``"qt.network"``).
+
+        .. versionadded:: 4.6
+
+        :rtype: list of `Record` instances.
+        """
+        head, tail = self._get_indices()[1].get(category, ((), ()))
+        return [*head, *tail]
+
+    def count(self, level=None, category=None):
+        """Number of messages captured so far, optionally only counting the
+        messages with the given level name and/or logging category.
+
+        .. versionadded:: 4.6
+
+        :rtype: int
+        """
+        if level is None and category is None:
+            self._flush_thread_buffers()
+            return len(self._records) + len(self._tail)
+        if category is None:
+            head, tail = self._get_indices()[0].get(level, ((), ()))
+            return len(head) + len(tail)
+        head, tail = self._get_indices()[1].get(category, ((), ()))
+        if level is None:
+            return len(head) + len(tail)
+        return sum(
+            1 for rec in itertools.chain(head, tail) if rec.log_type_name == level
+        )
+
+    def waitForMessage(self, regex, *, timeout=5000):
+        """Wait until a message matching the given regex is captured, returning
+        its `Record`.
+
+        Messages captured before the call are also considered. The wait is woken
+        up directly when the message is captured, without polling.
+
+        .. versionadded:: 4.6
+
+        :param str regex: regular expression searched in the messages.
+        :param int timeout: timeout in milliseconds.
+        :raises TimeoutError: if no matching message is captured in time.
+        :rtype: Record
+
+        .. note:: This method is also available as ``wait_for_message`` (pep-8 alias)
+        """
+        __tracebackhide__ = True
+        pattern = re.compile(regex)
+        for rec in self.iter_records():
+            if pattern.search(rec.message):
+                return rec
+
+        blocker = CallbackBlocker(timeout=timeout, raising=False)
+        waiter = (pattern, blocker)
+        self._message_waiters.append(waiter)
+        # messages buffered by other threads since iter_records() was called
+        self._flush_thread_buffers()
+        try:
+            blocker.wait()
+        finally:
+            self._message_waiters.remove(waiter)
+        if not blocker.called:
+            raise TimeoutError(
+                f"No Qt message matching {regex!r} was captured after {timeout}ms."
+            )
+        return blocker.args[0]
+
+    wait_for_message = waitForMessage
+
+    @property
+    def dropped_counts(self):
+        """Number of messages dropped because of ``qt_log_max_records``, by level
+        name (``"DEBUG"``, ``"WARNING"``, ...).
+
+        .. versionadded:: 4.6
+
+        :rtype: dict
+        """
+        self._flush_thread_buffers()
+        return dict(self._dropped_counts)
+
+
+# severity of each message type, from the least to the most severe; note that for
+# historical reasons QtInfoMsg is considered less severe than QtDebugMsg
+(
+    _SEVERITY_INFO,
+    _SEVERITY_DEBUG,
+    _SEVERITY_WARNING,
+    _SEVERITY_CRITICAL,
+    _SEVERITY_FATAL,
+) = range(5)
+_TYPE_NAMES = ("QtInfoMsg", "QtDebugMsg", "QtWarningMsg", "QtCriticalMsg", "QtFatalMsg")
+_LOG_TYPE_NAMES = ("INFO", "DEBUG", "WARNING", "CRITICAL", "FATAL")
+
+# minimum severity of the messages matching each of QtLoggingPlugin.LOG_FAIL_OPTIONS
+_LEVEL_THRESHOLDS = {
+    "NO": None,
+    "CRITICAL": _SEVERITY_CRITICAL,
+    "WARNING": _SEVERITY_WARNING,
+    "DEBUG": _SEVERITY_DEBUG,
+    "INFO": _SEVERITY_INFO,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_severities():
+    """
+    Return a dict mapping each QtMsgType to its severity; built lazily because
+    the Qt API is only available after ``qt_api.set_qt_api`` is called.
+    """
+    QtMsgType = qt_api.QtCore.QtMsgType
+    return {
+        QtMsgType.QtInfoMsg: _SEVERITY_INFO,
+        QtMsgType.QtDebugMsg: _SEVERITY_DEBUG,
+        QtMsgType.QtWarningMsg: _SEVERITY_WARNING,
+        QtMsgType.QtCriticalMsg: _SEVERITY_CRITICAL,
+        QtMsgType.QtFatalMsg: _SEVERITY_FATAL,
+    }
+
+
+# wall clock time matching the monotonic clock's origin, used to convert the
+# monotonic timestamps of records to datetimes
+_MONOTONIC_ORIGIN_NS = time.time_ns() - time.monotonic_ns()
 
 
 class Record:
@@ -216,6 +736,8 @@ class Record:
         type name similar to the logging package: ``INFO``, ``DEBUG``,
         ``WARNING`` and ``CRITICAL``.
     :ivar datetime.datetime when: when the message was captured
+    :ivar int timestamp_ns: when the message was captured, as returned by
+        :func:`time.monotonic_ns`.
     :ivar bool ignored: If this record matches a regex from the "qt_log_ignore"
         option.
     :ivar context: a namedtuple containing the attributes ``file``,
@@ -223,69 +745,183 @@ class Record:
         message.
     """
 
-    def __init__(self, msg_type, message, ignored, context):
+    __slots__ = (
+        "_type",
+        "_message",
+        "_severity",
+        "_type_name",
+        "_log_type_name",
+        "_timestamp_ns",
+        "_ignored",
+        "_context",
+    )
+
+    def __init__(self, msg_type, message, ignored, context, timestamp_ns=None):
         self._type = msg_type
         self._message = message
-        self._type_name = self._get_msg_type_name(msg_type)
-        self._log_type_name = self._get_log_type_name(msg_type)
-        self._when = datetime.datetime.now()
+        self._severity = severity = _get_severities()[msg_type]
+        self._type_name = _TYPE_NAMES[severity]
+        self._log_type_name = _LOG_TYPE_NAMES[severity]
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        self._timestamp_ns = timestamp_ns
         self._ignored = ignored
         self._context = context
 
-    message = property(lambda self: self._message)
-    type = property(lambda self: self._type)
-    type_name = property(lambda self: self._type_name)
-    log_type_name = property(lambda self: self._log_type_name)
-    when = property(lambda self: self._when)
-    ignored = property(lambda self: self._ignored)
-    context = property(lambda self: self._context)
-
-    @classmethod
-    def _get_msg_type_name(cls, msg_type):
-        """
-        Return a string representation of the given QtMsgType enum
-        value.
-        """
-        if not getattr(cls, "_type_name_map", None):
-            cls._type_name_map = {
-                qt_api.QtCore.QtMsgType.QtDebugMsg: "QtDebugMsg",
-                qt_api.QtCore.QtMsgType.QtWarningMsg: "QtWarningMsg",
-                qt_api.QtCore.QtMsgType.QtCriticalMsg: "QtCriticalMsg",
-                qt_api.QtCore.QtMsgType.QtFatalMsg: "QtFatalMsg",
-                qt_api.QtCore.QtMsgType.QtInfoMsg: "QtInfoMsg",
-            }
-        return cls._type_name_map[msg_type]
+    # read-only accessors implemented in C, which don't execute Python code
+    message = property(operator.attrgetter("_message"))
+    type = property(operator.attrgetter("_type"))
+    type_name = property(operator.attrgetter("_type_name"))
+    log_type_name = property(operator.attrgetter("_log_type_name"))
+    timestamp_ns = property(operator.attrgetter("_timestamp_ns"))
+    ignored = property(operator.attrgetter("_ignored"))
+    context = property(operator.attrgetter("_context"))
 
-    @classmethod
-    def _get_log_type_name(cls, msg_type):
+    @property
+    def when(self):
+        return datetime.datetime.fromtimestamp(
+            (_MONOTONIC_ORIGIN_NS + self._timestamp_ns) / 1e9
+        )
+
+    def matches_level(self, level):
+        threshold = _LEVEL_THRESHOLDS[level]
+        return threshold is not None and self._severity >= threshold
+
+
+def _group_records(records):
+    """
+    Group consecutive identical records, returning a list of ``(record, count)``
+    tuples; ``None`` items are kept as ``(None, 0)``.
+    """
+    groups = []
+    last_key = None
+    for rec in records:
+        if rec is None:
+            groups.append((None, 0))
+            last_key = None
+            continue
+        key = (rec.type, rec.message, rec.ignored, rec.context)
+        if key == last_key:
+            groups[-1] = (groups[-1][0], groups[-1][1] + 1)
+        else:
+            groups.append((rec, 1))
+            last_key = key
+    return groups
+
+
+class _QtLogStatistics:
+    """
+    Counts the records captured during the session (see ``--qt-log-summary``).
+    """
+
+    def __init__(self):
+        self.levels = Counter()
+        self.categories = Counter()
+        self.tests = Counter()
+
+    def add(self, nodeid, record):
+        context = record.context
+        self.levels[record.log_type_name] += 1
+        self.categories[None if context is None else context.category] += 1
+        self.tests[nodeid] += 1
+
+    def write_summary(self, terminalreporter, size):
         """
-        Return a string representation of the given QtMsgType enum
-        value in the same style used by the builtin logging package.
+        Writes the counts per level and category, and the ``size`` tests and
+        categories with the most messages.
         """
-        if not getattr(cls, "_log_type_name_map", None):
-            cls._log_type_name_map = {
-                qt_api.QtCore.QtMsgType.QtDebugMsg: "DEBUG",
-                qt_api.QtCore.QtMsgType.QtWarningMsg: "WARNING",
-                qt_api.QtCore.QtMsgType.QtCriticalMsg: "CRITICAL",
-                qt_api.QtCore.QtMsgType.QtFatalMsg: "FATAL",
-                qt_api.QtCore.QtMsgType.QtInfoMsg: "INFO",
-            }
-        return cls._log_type_name_map[msg_type]
+        tr = terminalreporter
+        tr.write_sep("=", "Qt messages summary")
+        total = sum(self.levels.values())
+        tr.write_line(f"{total} Qt messages captured")
+        if not total:
+            return
+        levels = ", ".join(
+            f"{level}: {self.levels[level]}"
+            for level in _LOG_TYPE_NAMES
+            if self.levels[level]
+        )
+        tr.write_line(f"by level: {levels}")
+        for title, counter in (
+            ("categories", self.categories),
+            ("tests", self.tests),
+        ):
+            tr.write_line(f"top {title} (of {len(counter)}):")
+            for key, count in counter.most_common(size):
+                tr.write_line(f"{count:>10} {key}")
 
-    def matches_level(self, level):
-        assert level in QtLoggingPlugin.LOG_FAIL_OPTIONS
-        if level == "NO":
-            return False
-        elif level == "INFO":
-            return self.log_type_name in ("INFO", "DEBUG", "WARNING", "CRITICAL")
-        elif level == "DEBUG":
-            return self.log_type_name in ("DEBUG", "WARNING", "CRITICAL")
-        elif level == "WARNING":
-            return self.log_type_name in ("WARNING", "CRITICAL")
-        elif level == "CRITICAL":
-            return self.log_type_name in ("CRITICAL",)
-        else:  # pragma: no cover
-            raise ValueError(f"log_fail_level unknown: {level}")
+
+def _get_log_file_path(config):
+    """
+    Returns the path of the file the records are written to (see ``--qt-log-file``),
+    or None.
+
+    With pytest-xdist, each worker writes to its own file, suffixed with the worker
+    id (e.g. ``qt-log.gw0.jsonl``), and the controller, which runs no tests, writes
+    no file.
+    """
+    path = config.getoption("qt_log_file")
+    if path is None:
+        return None
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    if worker is not None:
+        root, ext = os.path.splitext(path)
+        return f"{root}.{worker}{ext}"
+    if getattr(config.option, "dist", "no") != "no":
+        return None
+    return path
+
+
+class _QtLogFileWriter:
+    """
+    Writes records to a file as JSON lines (see ``--qt-log-file``).
+
+    Records are serialized and written by a separate thread, so writing a record
+    only puts it in a queue.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "w", encoding="utf-8")
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="pytest-qt log file writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, nodeid, record, time_ms):
+        """
+        Queues the given record, captured ``time_ms`` milliseconds after the start
+        of the test with the given node id, to be written to the file.
+        """
+        self._queue.put((nodeid, record, time_ms))
+
+    def close(self):
+        """
+        Writes the pending records and closes the file.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            nodeid, record, time_ms = item
+            context = record.context
+            if context is None:
+                context = _QtMessageCapture._Context(None, None, 0, None)
+            entry = {
+                "nodeid": nodeid,
+                "level": record.log_type_name,
+                "category": context.category,
+                "file": context.file,
+                "line": context.line,
+                "time_ms": round(time_ms, 3),
+                "message": record.message,
+            }
+            self._file.write(json.dumps(entry) + "\n")
 
 
 class _QtLogLevelErrorRepr(TerminalRepr):
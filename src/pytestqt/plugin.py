@@ -1,14 +1,19 @@
+import functools
+import time
 import warnings
 
 import pytest
 
-from pytestqt.exceptions import (
-    _is_exception_capture_enabled,
-    _QtExceptionCaptureManager,
-)
+from pytestqt.exceptions import _QtExceptionCaptureManager
+from pytestqt.item_config import EVENT_DRAIN_OPTIONS, get_item_config
 from pytestqt.logging import QtLoggingPlugin, _QtMessageCapture
 from pytestqt.qt_compat import qt_api
-from pytestqt.qtbot import QtBot, _close_widgets
+from pytestqt.qtbot import QtBot, _close_widgets, _delete_widgets, _parse_ini_boolean
+from pytestqt.resources import QtResourcePlugin
+
+# Qt modules imported when pytest starts with qt_lazy_imports = false, as they
+# were before the other modules were imported lazily
+_EAGER_QT_MODULES = ["QtGui", "QtWidgets", "QtTest"]
 
 
 @pytest.fixture(scope="session")
@@ -134,6 +139,42 @@ def pytest_addoption(parser):
     parser.addini(
         "qt_qapp_name", "The Qt application name to use", default="pytest-qt-qapp"
     )
+    parser.addini(
+        "qt_lazy_imports",
+        "import the Qt modules other than QtCore when first used; set to false to "
+        "import QtGui, QtWidgets and QtTest when pytest starts (default: true)",
+    )
+    parser.addini(
+        "qt_only_qt_tests",
+        "only process Qt events, capture exceptions and capture Qt messages for tests "
+        "using the qapp, qtbot, qtlog or qtmodeltester fixtures, or the qt mark",
+    )
+    parser.addini(
+        "qt_event_drain",
+        "how pending events are processed after setup, after the test and around "
+        'teardown: {} (default: "{}")'.format(
+            EVENT_DRAIN_OPTIONS, EVENT_DRAIN_OPTIONS[0]
+        ),
+    )
+    parser.addini(
+        "qt_event_drain_max_iterations",
+        "maximum number of times events are processed by each until-idle drain "
+        "(default: 100)",
+    )
+    parser.addini(
+        "qt_event_drain_timeout",
+        "maximum time in ms spent by each until-idle drain (default: 1000)",
+    )
+    parser.addini(
+        "qt_teardown_timeout",
+        "maximum time in ms spent deleting the widgets registered with "
+        "qtbot.addWidget after each test (default: 1000)",
+    )
+    parser.addini(
+        "qt_record_deleted_widgets",
+        "record the number of widgets deleted after each test in the "
+        "qt_deleted_widgets user property",
+    )
 
     default_log_fail = QtLoggingPlugin.LOG_FAIL_OPTIONS[0]
     parser.addini(
@@ -143,11 +184,34 @@ def pytest_addoption(parser):
         ),
         default=default_log_fail,
     )
+    default_log_capture = QtLoggingPlugin.LOG_CAPTURE_OPTIONS[0]
+    parser.addini(
+        "qt_log_capture_level",
+        'least severe log level which is captured: {} (default: "{}")'.format(
+            QtLoggingPlugin.LOG_CAPTURE_OPTIONS, default_log_capture
+        ),
+        default=default_log_capture,
+    )
+    parser.addini(
+        "qt_log_max_records",
+        "maximum number of Qt messages kept for each test, the oldest messages after "
+        "the first half being dropped (default: no limit)",
+    )
+    parser.addini(
+        "qt_log_report_max_messages",
+        "maximum number of Qt messages shown in the report of failed tests, the "
+        "messages in the middle being omitted (default: no limit)",
+    )
     parser.addini(
         "qt_log_ignore",
         "list of regexes for messages that should not cause a tests " "to fails",
         type="linelist",
     )
+    parser.addini(
+        "qt_log_fail_fast",
+        "abort waits and fail tests as soon as a message at or above "
+        "qt_log_level_fail is emitted",
+    )
 
     group = parser.getgroup("qt", "qt testing")
     group.addoption(
@@ -163,6 +227,49 @@ def pytest_addoption(parser):
         default=None,
         help="defines how qt log messages are displayed.",
     )
+    group.addoption(
+        "--qt-log-file",
+        dest="qt_log_file",
+        default=None,
+        metavar="path",
+        help="write all captured qt log messages to the given file, as JSON lines "
+        "(ignored with -s, --capture=no or --no-qt-log).",
+    )
+    group.addoption(
+        "--qt-log-summary",
+        dest="qt_log_summary",
+        type=int,
+        default=0,
+        metavar="N",
+        help="show the number of captured qt log messages per level and category, "
+        "and the N tests and categories with the most messages (ignored with -s, "
+        "--capture=no or --no-qt-log).",
+    )
+    group.addoption(
+        "--qt-api-rescan",
+        dest="qt_api_rescan",
+        action="store_true",
+        default=False,
+        help="detect the Qt api to use again, instead of using the one detected by a "
+        "previous run (only used when no api is configured).",
+    )
+    group.addoption(
+        "--qt-resource-report",
+        dest="qt_resource_report",
+        type=int,
+        default=0,
+        metavar="N",
+        help="measure the resources (memory, python and Qt objects, threads, file "
+        "descriptors) used by each test, and show the N tests with the largest growth.",
+    )
+    group.addoption(
+        "--qt-resource-tracemalloc",
+        dest="qt_resource_tracemalloc",
+        action="store_true",
+        default=False,
+        help="with --qt-resource-report, also show the largest allocations of each "
+        "test using tracemalloc.",
+    )
 
 
 @pytest.hookimpl(wrapper=True, tryfirst=True)
@@ -171,12 +278,25 @@ def pytest_runtest_setup(item):
     Hook called after before test setup starts, to start capturing exceptions
     as early as possible.
     """
-    capture_enabled = _is_exception_capture_enabled(item)
+    try:
+        item_config = get_item_config(item)
+    except (ValueError, AssertionError):
+        # let the other hooks set up the item first, so it is torn down normally
+        yield
+        raise
+    if not item_config.enabled:
+        return (yield)
+    capture_enabled = item_config.exception_capture
     if capture_enabled:
-        item.qt_exception_capture_manager = _QtExceptionCaptureManager()
+        item.qt_exception_capture_manager = _QtExceptionCaptureManager(
+            fail_fast=True, deferred=True
+        )
+        item.qt_exception_capture_manager.when = "SETUP"
         item.qt_exception_capture_manager.start()
     result = yield
-    _process_events()
+    # resolved again if the fixtures applied marks to the item
+    item_config = get_item_config(item)
+    _drain_events(item, item_config)
     if capture_enabled:
         item.qt_exception_capture_manager.fail_if_exceptions_occurred("SETUP")
     return result
@@ -184,9 +304,14 @@ def pytest_runtest_setup(item):
 
 @pytest.hookimpl(wrapper=True, tryfirst=True)
 def pytest_runtest_call(item):
+    item_config = get_item_config(item)
+    if not item_config.enabled:
+        return (yield)
+    capture_enabled = item_config.exception_capture
+    if capture_enabled:
+        item.qt_exception_capture_manager.when = "CALL"
     result = yield
-    _process_events()
-    capture_enabled = _is_exception_capture_enabled(item)
+    _drain_events(item, item_config)
     if capture_enabled:
         item.qt_exception_capture_manager.fail_if_exceptions_occurred("CALL")
     return result
@@ -199,28 +324,129 @@ def pytest_runtest_teardown(item):
     avoiding leaking events to the next test. Also, if exceptions have
     been captured during fixtures teardown, fail the test.
     """
-    _process_events()
-    _close_widgets(item)
-    _process_events()
-    result = yield
-    _process_events()
-    capture_enabled = _is_exception_capture_enabled(item)
+    try:
+        item_config = get_item_config(item)
+    except (ValueError, AssertionError):
+        # already reported when setting up the item
+        result = yield
+        if hasattr(item, "qt_exception_capture_manager"):
+            item.qt_exception_capture_manager.finish()
+        return result
+    if not item_config.enabled:
+        return (yield)
+    capture_enabled = item_config.exception_capture
+    if capture_enabled:
+        item.qt_exception_capture_manager.when = "TEARDOWN"
+    _drain_events(item, item_config)
+    closed_widgets = _close_widgets(item)
+    _drain_events(item, item_config)
+    try:
+        result = yield
+    finally:
+        # the fixtures are torn down, nothing should use the widgets anymore
+        deleted = _delete_widgets(closed_widgets, item_config.teardown_timeout)
+        if item_config.record_deleted_widgets:
+            item.user_properties.append(("qt_deleted_widgets", deleted))
+    _drain_events(item, item_config)
+    if item_config.event_drain == "until-idle":
+        item.user_properties.append(
+            ("qt_events_drained", getattr(item, "qt_events_drained", 0))
+        )
+        item.user_properties.append(
+            ("qt_events_pending", getattr(item, "qt_events_pending", 0))
+        )
     if capture_enabled:
         item.qt_exception_capture_manager.fail_if_exceptions_occurred("TEARDOWN")
+    if hasattr(item, "qt_exception_capture_manager"):
+        # also when a qt_no_exception_capture mark was applied after setup started
         item.qt_exception_capture_manager.finish()
     return result
 
 
-def _process_events():
-    """Calls app.processEvents() while taking care of capturing exceptions
-    or not based on the given item's configuration.
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
     """
-    app = qt_api.QtWidgets.QApplication.instance()
-    if app is not None:
+    Resolve the pytest-qt configuration of each item once, so the other hooks
+    don't need to look up the ini options and marks again.
+
+    Runs last, so marks applied to the items by other plugins are taken into account.
+    """
+    for item in items:
+        try:
+            get_item_config(item)
+        except (ValueError, AssertionError):
+            # invalid configuration, reported when setting up the item
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def _get_event_counter_class():
+    """
+    Returns the event filter class counting the events drained by ``_drain_events``.
+
+    The class is created lazily because ``qt_api`` is only set up in
+    ``pytest_configure``.
+    """
+
+    class _EventCounter(qt_api.QtCore.QObject):
+        def __init__(self):
+            super().__init__()
+            self.count = 0
+
+        def eventFilter(self, obj, event):
+            self.count += 1
+            return False
+
+    return _EventCounter
+
+
+def _drain_events(item, item_config):
+    """
+    Processes the pending events following the ``qt_event_drain`` policy of the item:
+
+    * ``single``: calls ``app.processEvents()`` once;
+    * ``until-idle``: processes events and ``DeferredDelete`` events (which
+      ``processEvents()`` ignores outside of an event loop) until no event is left, or
+      the iterations or time budget is exhausted;
+    * ``none``: does nothing.
+
+    For ``until-idle``, the number of events drained is accumulated in
+    ``item.qt_events_drained``, and ``item.qt_events_pending`` is the number of events
+    processed by the last iteration when the budget was exhausted (0 when the
+    application was idle).
+    """
+    if item_config.event_drain == "none":
+        return
+    app = qt_api.QtCore.QCoreApplication.instance()
+    if app is None:
+        return
+    if item_config.event_drain == "single":
         app.processEvents()
+        return
+    counter = _get_event_counter_class()()
+    app.installEventFilter(counter)
+    try:
+        pending = 0
+        deadline = time.monotonic() + item_config.event_drain_timeout / 1000
+        for _ in range(item_config.event_drain_max_iterations):
+            before = counter.count
+            app.processEvents()
+            app.sendPostedEvents(None, qt_api.QtCore.QEvent.Type.DeferredDelete)
+            pending = counter.count - before
+            if pending == 0 or time.monotonic() >= deadline:
+                break
+        item.qt_events_pending = pending
+    finally:
+        app.removeEventFilter(counter)
+    item.qt_events_drained = getattr(item, "qt_events_drained", 0) + counter.count
 
 
 def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "qt: the test uses Qt without requesting pytest-qt fixtures (see the "
+        "qt_only_qt_tests ini option).",
+    )
     config.addinivalue_line(
         "markers",
         "qt_no_exception_capture: Disables pytest-qt's automatic exception "
@@ -234,11 +460,44 @@ def pytest_configure(config):
         "markers", "qt_log_ignore: overrides qt_log_ignore ini option."
     )
     config.addinivalue_line("markers", "no_qt_log: Turn off Qt logging capture.")
+    config.addinivalue_line(
+        "markers", "qt_log_fail_fast: overrides qt_log_fail_fast ini option."
+    )
+    config.addinivalue_line(
+        "markers", "qt_log_capture_level: overrides qt_log_capture_level ini option."
+    )
 
     if config.getoption("qt_log") and config.getoption("capture") != "no":
         config.pluginmanager.register(QtLoggingPlugin(config), "_qt_logging")
+    else:
+        ignored = [
+            option
+            for option, dest in [
+                ("--qt-log-file", "qt_log_file"),
+                ("--qt-log-summary", "qt_log_summary"),
+            ]
+            if config.getoption(dest)
+        ]
+        if ignored:
+            config.issue_config_time_warning(
+                pytest.PytestConfigWarning(
+                    "{} ignored: Qt messages are not captured with -s, --capture=no "
+                    "or --no-qt-log".format(" and ".join(ignored))
+                ),
+                stacklevel=2,
+            )
 
-    qt_api.set_qt_api(config.getini("qt_api"))
+    if config.getoption("qt_resource_report") > 0:
+        config.pluginmanager.register(QtResourcePlugin(config), "_qt_resources")
+
+    qt_api.set_qt_api(
+        config.getini("qt_api"),
+        cache=getattr(config, "cache", None),
+        rescan=config.getoption("qt_api_rescan"),
+    )
+    if not _parse_ini_boolean(config.getini("qt_lazy_imports") or True):
+        for name in _EAGER_QT_MODULES:
+            getattr(qt_api, name)
 
 
 def pytest_report_header():
@@ -252,3 +511,13 @@ def pytest_report_header():
     ]
     version_line = " -- ".join(fields)
     return [version_line]
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """Show the time spent importing the Qt modules in verbose mode."""
+    if config.option.verbose > 0 and qt_api._import_times:
+        times = ", ".join(
+            f"{name} {seconds * 1000:.1f}ms"
+            for name, seconds in qt_api._import_times.items()
+        )
+        terminalreporter.write_line(f"Qt modules import time: {times}")
@@ -9,8 +9,10 @@ Based on from https://github.com/epage/PythonUtils.
 """
 
 from collections import namedtuple, OrderedDict
+import hashlib
 import os
 import sys
+import time
 
 import pytest
 
@@ -31,16 +33,61 @@ def _is_library_loaded(name):
     return name in sys.modules
 
 
+# key of the api detected by _guess_qt_api in pytest's cache
+_CACHE_KEY = "pytest-qt/qt_api"
+
+
+def _get_environment_fingerprint():
+    """
+    Returns a string identifying the interpreter and its installed packages, using
+    the modification times of the site-packages directories, which change when a
+    package is installed or removed.
+    """
+    parts = [sys.executable]
+    for path in sys.path:
+        parts.append(path)
+        if os.path.basename(path) in ("site-packages", "dist-packages"):
+            try:
+                parts.append(str(os.stat(path).st_mtime_ns))
+            except OSError:
+                pass
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
 class _QtApi:
     """
     Interface to the underlying Qt API currently configured for pytest-qt.
 
     This object lazily loads all class references and other objects when the ``set_qt_api`` method
     gets called, providing a uniform way to access the Qt classes.
+
+    Only ``QtCore`` is imported by ``set_qt_api``: the other Qt modules (``QtGui``, ``QtWidgets``,
+    ``QtTest``, but also ``QtNetwork``, ``QtSql``, ...) are imported when first accessed as
+    attributes of this object.
     """
 
     def __init__(self):
         self._import_errors = {}
+        # time in seconds spent importing each Qt module, in import order
+        self._import_times = {}
+
+    def __getattr__(self, name):
+        # only called for attributes not found normally, i.e. Qt modules not imported yet
+        if not name.startswith("Qt") or "pytest_qt_api" not in self.__dict__:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        module = self._import_module(name)
+        setattr(self, name, module)
+        return module
+
+    def _import_module(self, module_name):
+        root_module = QT_APIS[self.pytest_qt_api]
+        start = time.perf_counter()
+        m = __import__(root_module, globals(), locals(), [module_name], 0)
+        module = getattr(m, module_name)
+        self._import_times[module_name] = time.perf_counter() - start
+        return module
 
     def _get_qt_api_from_env(self):
         api = os.environ.get("PYTEST_QT_API")
@@ -75,13 +122,53 @@ class _QtApi:
                 return api
         return None
 
-    def set_qt_api(self, api):
+    def _get_cached_qt_api(self, cache):
+        """
+        Returns the api detected by a previous run in the same environment, if
+        it can still be imported.
+        """
+        entry = cache.get(_CACHE_KEY, None)
+        if not isinstance(entry, dict):
+            return None
+        api = entry.get("api")
+        if api not in QT_APIS:
+            return None
+        if entry.get("fingerprint") != _get_environment_fingerprint():
+            return None
+        # QtCore is imported by set_qt_api anyway, so this does not cost more
+        try:
+            _import(f"{QT_APIS[api]}.QtCore")
+        except ImportError:
+            return None
+        return api
+
+    def set_qt_api(self, api, cache=None, rescan=False):
+        """
+        :param cache: pytest's ``config.cache``, used to store the api detected when
+            no api is configured and no Qt library is loaded yet, so the next runs
+            don't need to try importing each library.
+        :param rescan: ignore the api stored in ``cache``, detecting it again.
+        """
         self.pytest_qt_api = (
             self._get_qt_api_from_env()
             or api
             or self._get_already_loaded_backend()
-            or self._guess_qt_api()
+            or (
+                self._get_cached_qt_api(cache)
+                if cache is not None and not rescan
+                else None
+            )
         )
+        if not self.pytest_qt_api:
+            self.pytest_qt_api = self._guess_qt_api()
+            if self.pytest_qt_api and cache is not None:
+                cache.set(
+                    _CACHE_KEY,
+                    {
+                        "fingerprint": _get_environment_fingerprint(),
+                        "api": self.pytest_qt_api,
+                    },
+                )
 
         self.is_pyside = self.pytest_qt_api in ["pyside6"]
         self.is_pyqt = self.pytest_qt_api in ["pyqt5", "pyqt6"]
@@ -97,16 +184,12 @@ class _QtApi:
             )
             raise pytest.UsageError(msg)
 
-        _root_module = QT_APIS[self.pytest_qt_api]
-
-        def _import_module(module_name):
-            m = __import__(_root_module, globals(), locals(), [module_name], 0)
-            return getattr(m, module_name)
+        # forget the modules imported for a previously configured api
+        for name in [name for name in self.__dict__ if name.startswith("Qt")]:
+            del self.__dict__[name]
+        self._import_times.clear()
 
-        self.QtCore = QtCore = _import_module("QtCore")
-        self.QtGui = _import_module("QtGui")
-        self.QtTest = _import_module("QtTest")
-        self.QtWidgets = _import_module("QtWidgets")
+        self.QtCore = QtCore = self._import_module("QtCore")
 
         self._check_qt_api_version()
 
@@ -1,5 +1,6 @@
 from collections.abc import Callable
 import contextlib
+import time
 from types import TracebackType
 import weakref
 import warnings
@@ -17,15 +18,18 @@ import pytest
 from typing_extensions import Self, TypeAlias
 
 from pytestqt.exceptions import TimeoutError, ScreenshotError
+from pytestqt.item_config import get_item_config
 from pytestqt.qt_compat import qt_api
 from pytestqt.wait_signal import (
     SignalBlocker,
     MultiSignalBlocker,
     SignalEmittedSpy,
     SignalEmittedError,
+    SignalRecorder,
     CallbackBlocker,
     CallbackCalledTwiceError,
     CheckParamsCb,
+    _raise_pending_abort,
 )
 
 from pytest import FixtureRequest
@@ -34,6 +38,7 @@ from pytest import FixtureRequest
 # versions possibly using 'qtpy' library.
 QWidget: TypeAlias = Any
 SignalInstance: TypeAlias = Any
+QObject: TypeAlias = Any
 QRect: TypeAlias = Any
 QKeySequence: TypeAlias = Any
 
@@ -44,6 +49,10 @@ if TYPE_CHECKING:
 BeforeCloseFunc = Callable[[QWidget], None]
 WaitSignalsOrder = Literal["none", "simple", "strict"]
 
+# interval (in ms) in which waitUntil checks its callback when waiting on signals,
+# in case the condition changes without any of the signals being emitted
+WAIT_UNTIL_SIGNALS_POLL_INTERVAL = 100
+
 
 def _parse_ini_boolean(value: Any) -> bool:
     if value in (True, False):
@@ -78,7 +87,9 @@ class QtBot:
     .. automethod:: waitSignal
     .. automethod:: waitSignals
     .. automethod:: assertNotEmitted
+    .. automethod:: recordSignals
     .. automethod:: waitUntil
+    .. automethod:: waitProperty
 
     **Raw QTest API**
 
@@ -188,25 +199,22 @@ class QtBot:
         self.wait_signal = self.waitSignal
         self.wait_signals = self.waitSignals
         self.assert_not_emitted = self.assertNotEmitted
+        self.record_signals = self.recordSignals
         self.wait_until = self.waitUntil
+        self.wait_property = self.waitProperty
         self.wait_callback = self.waitCallback
 
     def _should_raise(self, raising_arg: Optional[bool]) -> bool:
-        ini_val = self._request.config.getini("qt_default_raising")
-
         if raising_arg is not None:
             return raising_arg
-        elif ini_val:
-            return _parse_ini_boolean(ini_val)
-        else:
-            return True
+        return get_item_config(self._request.node).default_raising
 
     def addWidget(
         self, widget: QWidget, *, before_close_func: Optional[BeforeCloseFunc] = None
     ) -> None:
         """
         Adds a widget to be tracked by this bot. This is not required, but will ensure that the
-        widget gets closed by the end of the test, so it is highly recommended.
+        widget gets closed and deleted by the end of the test, so it is highly recommended.
 
         :param QWidget widget:
             Widget to keep track of.
@@ -339,6 +347,7 @@ class QtBot:
         timeout: int = 5000,
         raising: Optional[bool] = None,
         check_params_cb: Optional[CheckParamsCb] = None,
+        history: Optional[int] = None,
     ) -> "SignalBlocker":
         """
         .. versionadded:: 1.2
@@ -369,6 +378,9 @@ class QtBot:
         .. versionadded:: 2.0
            The *check_params_cb* parameter.
 
+        .. versionadded:: 4.6
+           The *history* parameter.
+
         :param Signal signal:
             A signal to wait for, or a tuple ``(signal, signal_name_as_str)`` to improve the error message that is part
             of :class:`qtbot.TimeoutError <pytestqt.exceptions.TimeoutError>`.
@@ -383,6 +395,10 @@ class QtBot:
             Optional ``callable`` that compares the provided signal parameters to some expected parameters.
             It has to match the signature of ``signal`` (just like a slot function would) and return ``True`` if
             parameters match, ``False`` otherwise.
+        :param int history:
+            Optional maximum number of emissions kept in ``SignalBlocker.all_args``. When given, only the most
+            recent emissions are kept, and their arguments are stored as truncated ``repr()`` strings instead of
+            references to the arguments themselves.
         :returns:
             ``SignalBlocker`` object. Call ``SignalBlocker.wait()`` to wait.
 
@@ -395,7 +411,10 @@ class QtBot:
             )
         raising = self._should_raise(raising)
         blocker = SignalBlocker(
-            timeout=timeout, raising=raising, check_params_cb=check_params_cb
+            timeout=timeout,
+            raising=raising,
+            check_params_cb=check_params_cb,
+            history=history,
         )
         blocker.connect(signal)
         return blocker
@@ -408,6 +427,7 @@ class QtBot:
         raising: Optional[bool] = None,
         check_params_cbs: Optional[list[CheckParamsCb]] = None,
         order: WaitSignalsOrder = "none",
+        history: Optional[int] = None,
     ) -> "MultiSignalBlocker":
         """
         .. versionadded:: 1.4
@@ -456,6 +476,12 @@ class QtBot:
             - ``"simple"``: like "strict", but signals may be emitted in-between the provided ones, e.g. expected
               ``signals == [a, b, c]`` and actually emitted ``signals = [a, a, b, a, c]`` works
               (would fail with ``"strict"``).
+        :param int history:
+            Optional maximum number of emissions kept in ``MultiSignalBlocker.all_signals_and_args``. When given,
+            only the most recent emissions are kept, and their arguments are stored as truncated ``repr()``
+            strings instead of references to the arguments themselves.
+
+            .. versionadded:: 4.6
 
         :returns:
             ``MultiSignalBlocker`` object. Call ``MultiSignalBlocker.wait()``
@@ -486,6 +512,7 @@ class QtBot:
             raising=raising,
             order=order,
             check_params_cbs=check_params_cbs,
+            history=history,
         )
         blocker.add_signals(signals)
         return blocker
@@ -498,7 +525,13 @@ class QtBot:
 
         While waiting, events will be processed and your test will stay
         responsive to user interface events or network communication.
+
+        ``qtbot.wait(0)`` processes the pending events and returns immediately.
         """
+        if ms == 0:
+            qt_api.QtCore.QCoreApplication.processEvents()
+            _raise_pending_abort()
+            return
         blocker = MultiSignalBlocker(timeout=ms, raising=False)
         blocker.wait()
 
@@ -526,8 +559,43 @@ class QtBot:
             yield
         spy.assert_not_emitted()
 
+    def recordSignals(
+        self, *signals: SignalInstance, timestamps: bool = False
+    ) -> "SignalRecorder":
+        """
+        .. versionadded:: 4.6
+
+        Records every emission of the given signals while inside the ``with`` block.
+
+        .. code-block:: python
+
+            with qtbot.recordSignals(sensor.sample, sensor.error) as recorder:
+                sensor.start()
+                qtbot.wait(1000)
+
+            assert recorder[sensor.error].count == 0
+            assert recorder.rate(sensor.sample) > 1000
+            assert recorder[sensor.sample].args(-1) == [42.0]
+
+        Emissions are recorded by a ``QSignalSpy``, without calling any Python code, so this
+        is suitable for signals emitted at a very high rate. Pass ``timestamps=True`` to also
+        record the time of each emission (which requires calling a Python slot on every
+        emission) and use :meth:`RecordedSignal.intervals() <pytestqt.wait_signal.RecordedSignal.intervals>`.
+
+        :param signals: the signals to record.
+        :param bool timestamps: record a monotonic timestamp for each emission.
+        :returns: a :class:`SignalRecorder <pytestqt.wait_signal.SignalRecorder>` object.
+
+        .. note:: This method is also available as ``record_signals`` (pep-8 alias)
+        """
+        return SignalRecorder(signals, timestamps=timestamps)
+
     def waitUntil(
-        self, callback: Callable[[], Optional[bool]], *, timeout: int = 5000
+        self,
+        callback: Callable[[], Optional[bool]],
+        *,
+        timeout: int = 5000,
+        signals: Optional[list[SignalInstance]] = None,
     ) -> None:
         """
         .. versionadded:: 2.0
@@ -558,16 +626,29 @@ class QtBot:
         Note that this usage only accepts returning actual ``True`` and ``False`` values,
         so returning an empty list to express "falseness" raises a ``ValueError``.
 
+        If the condition depends on state which announces its changes through signals, pass
+        those signals in ``signals``: the callback is then only called again when one of them
+        is emitted, instead of every 10 ms. The callback is still called every
+        ``WAIT_UNTIL_SIGNALS_POLL_INTERVAL`` ms (100 ms) as a fallback, in case the condition
+        changes without any of the signals being emitted.
+
+        .. code-block:: python
+
+            qtbot.waitUntil(lambda: model.rowCount() > 10, signals=[model.rowsInserted])
+
+        .. versionadded:: 4.6
+           The *signals* parameter.
+
         :param callback: callable that will be called periodically.
         :param timeout: timeout value in ms.
+        :param list signals:
+            Optional list of signals which trigger a new call of ``callback`` when emitted.
         :raises ValueError: if the return value from the callback is anything other than ``None``,
             ``True`` or ``False``.
 
         .. note:: This method is also available as ``wait_until`` (pep-8 alias)
         """
         __tracebackhide__ = True
-        import time
-
         start = time.time()
 
         def timed_out():
@@ -597,7 +678,62 @@ class QtBot:
                     return
                 if timed_out():
                     raise TimeoutError(timeout_msg)
-            self.wait(10)
+            if signals:
+                remaining_ms = timeout - (time.time() - start) * 1000
+                interval = max(
+                    1, int(min(WAIT_UNTIL_SIGNALS_POLL_INTERVAL, remaining_ms))
+                )
+                blocker = SignalBlocker(timeout=interval, raising=False)
+                for signal in signals:
+                    blocker.connect(signal)
+                blocker.wait()
+            else:
+                self.wait(10)
+
+    def waitProperty(
+        self, obj: QObject, name: str, value: Any, *, timeout: int = 5000
+    ) -> None:
+        """
+        .. versionadded:: 4.6
+
+        Wait until the Qt property ``name`` of ``obj`` is equal to ``value``.
+
+        .. code-block:: python
+
+            qtbot.waitProperty(progress_bar, "value", 100)
+
+        If the property declares a ``NOTIFY`` signal, the property is only checked again when
+        that signal is emitted (see the *signals* parameter of :meth:`waitUntil`), otherwise it
+        is polled like :meth:`waitUntil` does.
+
+        :param QObject obj: the object owning the property.
+        :param str name: name of the property, as declared in the object's meta-object, or
+            a dynamic property set with ``QObject.setProperty``.
+        :param value: the expected value of the property.
+        :param int timeout: timeout value in ms.
+        :raises ValueError: if ``obj`` has no property called ``name``.
+
+        .. note:: This method is also available as ``wait_property`` (pep-8 alias)
+        """
+        __tracebackhide__ = True
+        meta_object = obj.metaObject()
+        index = meta_object.indexOfProperty(name)
+        signals = None
+        if index != -1:
+            meta_property = meta_object.property(index)
+            if meta_property.hasNotifySignal():
+                signal_name = bytes(meta_property.notifySignal().name()).decode()
+                signals = [getattr(obj, signal_name)]
+        elif name.encode() not in [bytes(n) for n in obj.dynamicPropertyNames()]:
+            raise ValueError(f"{obj!r} has no property named {name!r}")
+
+        def check_property():
+            current = obj.property(name)
+            assert (
+                current == value
+            ), f"property {name!r} is {current!r}, expected {value!r}"
+
+        self.waitUntil(check_property, timeout=timeout, signals=signals)
 
     def waitCallback(
         self, *, timeout: int = 5000, raising: Optional[bool] = None
@@ -794,20 +930,73 @@ def _add_widget(
     item.qt_widgets = qt_widgets  # type: ignore[attr-defined]
 
 
-def _close_widgets(item: pytest.Item) -> None:
+def _close_widgets(item: pytest.Item) -> list[weakref.ReferenceType[QWidget]]:
     """
     Close all widgets registered in the pytest item.
+
+    Updates are disabled before closing the widgets, so they are not repainted
+    while being torn down. The widgets are only deleted by ``_delete_widgets``,
+    after the fixtures were torn down, because fixture finalizers might still
+    use them.
+
+    Returns weak references to the closed widgets.
     """
     widgets = getattr(item, "qt_widgets", None)
-    if widgets:
-        for w, before_close_func in item.qt_widgets:  # type: ignore[attr-defined]
-            w = w()
-            if w is not None:
-                if before_close_func is not None:
-                    before_close_func(w)
-                w.close()
-                w.deleteLater()
-        del item.qt_widgets  # type: ignore[attr-defined]
+    if not widgets:
+        return []
+    del item.qt_widgets  # type: ignore[attr-defined]
+
+    closed = []
+    for w, before_close_func in widgets:
+        w = w()
+        if w is not None:
+            if before_close_func is not None:
+                before_close_func(w)
+            w.setUpdatesEnabled(False)
+            w.close()
+            closed.append(weakref.ref(w))
+    return closed
+
+
+def _delete_widgets(
+    widgets: list[weakref.ReferenceType[QWidget]], timeout: int = 1000
+) -> int:
+    """
+    Delete the widgets closed by ``_close_widgets`` which are still alive.
+
+    ``processEvents()`` does not process ``DeferredDelete`` events outside of an
+    event loop, so they are sent explicitly until all the widgets are deleted, a
+    pass deletes none of them, or ``timeout`` ms elapsed.
+
+    Returns the number of widgets deleted.
+    """
+    # ids of the widgets not deleted yet
+    pending: set[int] = set()
+
+    for ref in widgets:
+        w = ref()
+        if w is not None:
+            key = id(w)
+            pending.add(key)
+            w.destroyed.connect(lambda *args, key=key: pending.discard(key))
+            w.deleteLater()
+    total = len(pending)
+    if not pending:
+        return 0
+
+    app = qt_api.QtCore.QCoreApplication.instance()
+    if app is None:
+        return total - len(pending)
+    deadline = time.monotonic() + timeout / 1000
+    while pending and time.monotonic() < deadline:
+        remaining = len(pending)
+        app.sendPostedEvents(None, qt_api.QtCore.QEvent.Type.DeferredDelete)
+        if len(pending) == remaining:
+            # no widget deleted by this pass, the others won't be either
+            break
+    # objects deleted later by the destructors of the widgets
+    app.sendPostedEvents(None, qt_api.QtCore.QEvent.Type.DeferredDelete)
+    return total - len(pending)
 
 
 def _iter_widgets(item: pytest.Item) -> Iterator[weakref.ReferenceType[QWidget]]:
@@ -0,0 +1,221 @@
+import gc
+import os
+import threading
+from collections import Counter, namedtuple
+
+import pytest
+
+from pytestqt.qt_compat import qt_api
+
+_ResourceSnapshot = namedtuple(
+    "_ResourceSnapshot", "rss objects qobjects top_level_widgets threads fds"
+)
+_TestResourceGrowth = namedtuple(
+    "_TestResourceGrowth", "nodeid growth qobjects allocations"
+)
+
+
+def _get_rss():
+    """Resident set size of the process in bytes, or None if not available."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def _get_fds():
+    """Number of open file descriptors, or None if not available."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def _take_snapshot():
+    """
+    Takes a snapshot of the resources used by the process, after a full garbage
+    collection.
+
+    Python threads and running ``QThread`` instances are both counted in
+    ``threads``; ``qobjects`` is a ``Counter`` of the live ``QObject`` wrappers by
+    class name.
+    """
+    gc.collect()
+    objects = gc.get_objects()
+    QObject = qt_api.QtCore.QObject
+    QThread = qt_api.QtCore.QThread
+    qobjects = Counter()
+    running_qthreads = 0
+    for obj in objects:
+        if isinstance(obj, QObject):
+            try:
+                qobjects[type(obj).__name__] += 1
+                if isinstance(obj, QThread) and obj.isRunning():
+                    running_qthreads += 1
+            except RuntimeError:
+                # wrapper of an already deleted C++ object
+                pass
+    app = qt_api.QtWidgets.QApplication.instance()
+    if isinstance(app, qt_api.QtWidgets.QApplication):
+        top_level_widgets = len(app.topLevelWidgets())
+    else:
+        top_level_widgets = 0
+    snapshot = _ResourceSnapshot(
+        rss=_get_rss(),
+        objects=len(objects),
+        qobjects=qobjects,
+        top_level_widgets=top_level_widgets,
+        threads=threading.active_count() + running_qthreads,
+        fds=_get_fds(),
+    )
+    del objects
+    return snapshot
+
+
+def _diff(before, after):
+    """
+    Returns the growth between two snapshots, as a snapshot of differences (with
+    ``qobjects`` being the total number of ``QObject`` wrappers).
+    """
+    return _ResourceSnapshot(
+        rss=(
+            after.rss - before.rss
+            if after.rss is not None and before.rss is not None
+            else None
+        ),
+        objects=after.objects - before.objects,
+        qobjects=sum(after.qobjects.values()) - sum(before.qobjects.values()),
+        top_level_widgets=after.top_level_widgets - before.top_level_widgets,
+        threads=after.threads - before.threads,
+        fds=(
+            after.fds - before.fds
+            if after.fds is not None and before.fds is not None
+            else None
+        ),
+    )
+
+
+def _format_bytes(size):
+    return f"{size / 2**20:+.1f} MiB"
+
+
+def _format_growth(growth):
+    fields = []
+    if growth.rss is not None:
+        fields.append(f"rss {_format_bytes(growth.rss)}")
+    fields.append(f"objects {growth.objects:+d}")
+    fields.append(f"QObjects {growth.qobjects:+d}")
+    fields.append(f"top-level widgets {growth.top_level_widgets:+d}")
+    fields.append(f"threads {growth.threads:+d}")
+    if growth.fds is not None:
+        fields.append(f"fds {growth.fds:+d}")
+    return ", ".join(fields)
+
+
+class QtResourcePlugin:
+    """
+    Plugin responsible for taking resource snapshots around each test and
+    reporting the tests which grew the process the most (see
+    ``--qt-resource-report``).
+    """
+
+    # number of QObject classes and tracemalloc allocations shown per test
+    DETAILS_SIZE = 5
+
+    def __init__(self, config):
+        self.config = config
+        self._report_size = config.getoption("qt_resource_report")
+        self._tracemalloc = config.getoption("qt_resource_tracemalloc")
+        self._tests = []
+        self._first_snapshot = None
+        self._last_snapshot = None
+
+    def pytest_sessionstart(self, session):
+        if self._tracemalloc:
+            import tracemalloc
+
+            tracemalloc.start()
+
+    def pytest_unconfigure(self, config):
+        if self._tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+
+    @pytest.hookimpl(wrapper=True, tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        item.qt_resource_snapshot = _take_snapshot()
+        if self._tracemalloc:
+            import tracemalloc
+
+            item.qt_tracemalloc_snapshot = tracemalloc.take_snapshot()
+        if self._first_snapshot is None:
+            self._first_snapshot = item.qt_resource_snapshot
+        return (yield)
+
+    @pytest.hookimpl(wrapper=True, tryfirst=True)
+    def pytest_runtest_teardown(self, item):
+        result = yield
+        before = getattr(item, "qt_resource_snapshot", None)
+        if before is None:
+            return result
+        del item.qt_resource_snapshot
+        after = _take_snapshot()
+        self._last_snapshot = after
+
+        qobjects = after.qobjects.copy()
+        qobjects.subtract(before.qobjects)
+        qobjects = [
+            (name, count)
+            for name, count in qobjects.most_common(self.DETAILS_SIZE)
+            if count > 0
+        ]
+
+        allocations = []
+        tracemalloc_snapshot = getattr(item, "qt_tracemalloc_snapshot", None)
+        if tracemalloc_snapshot is not None:
+            import tracemalloc
+
+            del item.qt_tracemalloc_snapshot
+            stats = tracemalloc.take_snapshot().compare_to(
+                tracemalloc_snapshot, "lineno"
+            )
+            allocations = [
+                str(stat) for stat in stats[: self.DETAILS_SIZE] if stat.size_diff > 0
+            ]
+
+        self._tests.append(
+            _TestResourceGrowth(
+                item.nodeid, _diff(before, after), qobjects, allocations
+            )
+        )
+        return result
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Show the tests which grew the resources the most."""
+        tr = terminalreporter
+        tr.write_sep("=", "Qt resource report")
+        if self._first_snapshot is None or self._last_snapshot is None:
+            tr.write_line("no tests were run")
+            return
+        tr.write_line(
+            "session: "
+            + _format_growth(_diff(self._first_snapshot, self._last_snapshot))
+        )
+        tr.write_line(f"top {self._report_size} tests by growth:")
+
+        def key(test):
+            growth = test.growth
+            return (growth.rss or 0, growth.objects)
+
+        for test in sorted(self._tests, key=key, reverse=True)[: self._report_size]:
+            tr.write_line(f"{test.nodeid}: {_format_growth(test.growth)}")
+            if test.qobjects:
+                counts = ", ".join(
+                    f"{name} {count:+d}" for name, count in test.qobjects
+                )
+                tr.write_line(f"    QObjects: {counts}")
+            for allocation in test.allocations:
+                tr.write_line(f"    {allocation}")
@@ -1,6 +1,11 @@
+from array import array
+from collections import deque
 from collections.abc import Callable
 import functools
 import dataclasses
+import reprlib
+import time
+import weakref
 from typing import Any
 
 from pytestqt.exceptions import TimeoutError
@@ -8,6 +13,179 @@ from pytestqt.qt_compat import qt_api
 
 CheckParamsCb = Callable[..., bool]
 
+_arg_repr = reprlib.Repr()
+_arg_repr.maxstring = 80
+_arg_repr.maxother = 80
+
+
+class _ArgSummary(str):
+    """
+    Truncated ``repr()`` of a signal argument, stored in bounded signal histories instead
+    of the argument itself; its own ``repr()`` is the summary, so it shows up in error
+    messages just like the original argument would.
+    """
+
+    def __repr__(self):
+        return str(self)
+
+
+def _summarize_args(args):
+    return tuple(_ArgSummary(_arg_repr.repr(arg)) for arg in args)
+
+
+def _new_history(history):
+    """
+    Returns the container for the signal history of a blocker: a list if ``history``
+    is None (unbounded), or a ring buffer keeping the ``history`` most recent items.
+    """
+    if history is None:
+        return []
+    return deque(maxlen=history)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_pooled_event_loop_class():
+    """
+    Returns the ``QEventLoop`` subclass handed out by :class:`_EventLoopPool`.
+
+    The class is created lazily because ``qt_api.Slot`` is only available after
+    ``qt_api.set_qt_api()`` has been called.
+    """
+
+    class _PooledEventLoop(qt_api.QtCore.QEventLoop):
+        """
+        Event loop owning a single-shot timer; when the timer fires, the blocker
+        currently using the loop (its ``owner``) is told about the timeout.
+        """
+
+        def __init__(self):
+            super().__init__()
+            self.owner = None
+            self.timer = qt_api.QtCore.QTimer(self)
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self._timeout)
+
+        @qt_api.Slot()
+        def _timeout(self):
+            owner = self.owner
+            if owner is not None:
+                owner._quit_loop_by_timeout()
+            else:  # pragma: no cover
+                self.quit()
+
+    return _PooledEventLoop
+
+
+class _EventLoopPool:
+    """
+    Pool of reusable event loops (each with its timer) used by the blockers in this module,
+    so no Qt objects are created when a signal was already emitted before waiting, and
+    none are created and destroyed for each wait.
+
+    The pool is bound to the running ``QCoreApplication`` instance, and starts
+    over if a different instance is detected.
+    """
+
+    def __init__(self):
+        self._app_ref = None
+        self._free_loops = []
+
+    def acquire(self, owner, timeout):
+        """
+        Returns an event loop for ``owner`` to execute, calling
+        ``owner._quit_loop_by_timeout()`` after ``timeout`` ms (unless ``None``).
+        """
+        app = qt_api.QtCore.QCoreApplication.instance()
+        if self._app_ref is None or self._app_ref() is not app:
+            self._app_ref = weakref.ref(app) if app is not None else None
+            self._free_loops = []
+        if self._free_loops:
+            loop = self._free_loops.pop()
+        else:
+            loop = _get_pooled_event_loop_class()()
+        loop.owner = owner
+        if timeout is not None:
+            loop.timer.start(timeout)
+        return loop
+
+    def release(self, loop):
+        """Returns a loop obtained with :meth:`acquire` to the pool."""
+        loop.timer.stop()
+        loop.owner = None
+        self._free_loops.append(loop)
+
+
+_event_loop_pool = _EventLoopPool()
+
+# blockers currently executing an event loop in their wait() method, innermost last
+_waiting_blockers: list[Any] = []
+
+# set by _abort_waits(): reports the failure that aborted the waits, see _raise_pending_abort()
+_pending_abort = None
+
+
+def _abort_waits(fail):
+    """
+    Makes all blockers currently waiting return immediately, calling ``fail()`` (which is
+    expected to raise an exception) instead of waiting for their signal, callback or timeout.
+    If no blocker is waiting, the next one calls ``fail()`` before it starts waiting.
+
+    Used to fail tests as soon as a problem is detected. This might be called from any thread.
+    """
+    global _pending_abort
+    _pending_abort = fail
+    for blocker in list(_waiting_blockers):
+        blocker._quit_loop()
+
+
+def _clear_pending_abort():
+    global _pending_abort
+    _pending_abort = None
+
+
+def _raise_pending_abort():
+    """Calls the pending ``fail()`` function given to :func:`_abort_waits`, if any."""
+    __tracebackhide__ = True
+    global _pending_abort
+    fail = _pending_abort
+    if fail is not None:
+        _pending_abort = None
+        fail()
+
+
+def _exec_event_loop(blocker, is_done):
+    """
+    Executes an event loop from the pool on behalf of ``blocker``, until the blocker quits
+    it or its timeout is reached. Returns immediately if ``is_done()`` is already true.
+    """
+    __tracebackhide__ = True
+    if _pending_abort is not None:
+        _cleanup_aborted(blocker)
+    _raise_pending_abort()
+    blocker._loop = _event_loop_pool.acquire(blocker, blocker.timeout)
+    _waiting_blockers.append(blocker)
+    try:
+        # the signal/callback might have been emitted/called from another thread meanwhile
+        if not is_done() and _pending_abort is None:
+            qt_api.exec(blocker._loop)
+    finally:
+        _waiting_blockers.remove(blocker)
+        loop, blocker._loop = blocker._loop, None
+        _event_loop_pool.release(loop)
+    if _pending_abort is not None:
+        _cleanup_aborted(blocker)
+    _raise_pending_abort()
+
+
+def _cleanup_aborted(blocker):
+    """
+    Disconnects ``blocker`` from its signals before its wait is aborted, as it is when
+    the wait times out (``CallbackBlocker`` has no signals to disconnect from).
+    """
+    cleanup = getattr(blocker, "_cleanup", None)
+    if cleanup is not None:
+        cleanup()
+
 
 class _AbstractSignalBlocker:
     """
@@ -22,19 +200,13 @@ class _AbstractSignalBlocker:
 
     """
 
-    def __init__(self, timeout=5000, raising=True):
-        self._loop = qt_api.QtCore.QEventLoop()
+    def __init__(self, timeout=5000, raising=True, history=None):
+        self._loop = None  # obtained from _event_loop_pool only while waiting
         self.timeout = timeout
         self.signal_triggered = False
         self.raising = raising
         self._signals = None  # will be initialized by inheriting implementations
-        self._timeout_message = ""
-
-        self._timer = qt_api.QtCore.QTimer(self._loop)
-        self._timer.setSingleShot(True)
-        if timeout is not None:
-            self._timer.setInterval(timeout)
-        self._timer.timeout.connect(self._quit_loop_by_timeout)
+        self._history = history
 
     def wait(self):
         """
@@ -50,26 +222,31 @@ class _AbstractSignalBlocker:
             raise ValueError("No signals or timeout specified.")
 
         if self.timeout != 0:
-            if self.timeout is not None:
-                # asserts as a stop-gap for possible multithreading issues
-                assert not self.signal_triggered
-                self._timer.start()
-                assert not self.signal_triggered
-            qt_api.exec(self._loop)
+            _exec_event_loop(self, lambda: self.signal_triggered)
 
         if not self.signal_triggered and self.raising:
-            raise TimeoutError(self._timeout_message)
+            raise TimeoutError(self._get_timeout_error_message())
+
+    def _quit_loop(self):
+        loop = self._loop
+        if loop is not None:
+            loop.quit()
 
     def _quit_loop_by_timeout(self):
         try:
             self._cleanup()
         finally:
-            self._loop.quit()
+            self._quit_loop()
 
     def _cleanup(self):
-        # store timeout message before the data to construct it is lost
-        self._timeout_message = self._get_timeout_error_message()
-        self._timer.stop()
+        """Subclasses have to implement this, disconnecting from their signals."""
+        raise NotImplementedError  # pragma: no cover
+
+    def _history_args(self, args):
+        """Returns ``args`` as they should be stored in the signal history."""
+        if self._history is None:
+            return args
+        return _summarize_args(args)
 
     def _get_timeout_error_message(self):
         """Subclasses have to implement this, returning an appropriate error message for a TimeoutError."""
@@ -179,6 +356,12 @@ class SignalBlocker(_AbstractSignalBlocker):
         The arguments which were emitted by the signal, or None if the signal
         wasn't emitted at all.
 
+    :ivar list all_args:
+        The arguments of all emissions of the signal when using a ``check_params_cb``
+        (see :ref:`all_args <all-args>`). If a ``history`` size was given, only that many
+        of the most recent emissions are kept, and their arguments are stored as
+        truncated ``repr()`` strings.
+
     .. versionadded:: 1.10
        The *args* attribute.
 
@@ -186,11 +369,11 @@ class SignalBlocker(_AbstractSignalBlocker):
     .. automethod:: connect
     """
 
-    def __init__(self, timeout=5000, raising=True, check_params_cb=None):
-        super().__init__(timeout, raising=raising)
+    def __init__(self, timeout=5000, raising=True, check_params_cb=None, history=None):
+        super().__init__(timeout, raising=raising, history=history)
         self._signals = []
         self.args = None
-        self.all_args = []
+        self.all_args = _new_history(history)
         self.check_params_callback = check_params_cb
         self.signal_name = ""
 
@@ -214,7 +397,7 @@ class SignalBlocker(_AbstractSignalBlocker):
         quits the event loop and marks that we finished because of a signal.
         """
         if self.check_params_callback:
-            self.all_args.append(args)
+            self.all_args.append(self._history_args(args))
             if not self.check_params_callback(*args):
                 return  # parameter check did not pass
         try:
@@ -222,10 +405,9 @@ class SignalBlocker(_AbstractSignalBlocker):
             self.args = list(args)
             self._cleanup()
         finally:
-            self._loop.quit()
+            self._quit_loop()
 
     def _cleanup(self):
-        super()._cleanup()
         for signal in self._signals:
             _silent_disconnect(signal, self._quit_loop_by_signal)
         self._signals = []
@@ -300,13 +482,24 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
     .. automethod:: wait
     """
 
-    def __init__(self, timeout=5000, raising=True, check_params_cbs=None, order="none"):
-        super().__init__(timeout, raising=raising)
+    def __init__(
+        self,
+        timeout=5000,
+        raising=True,
+        check_params_cbs=None,
+        order="none",
+        history=None,
+    ):
+        super().__init__(timeout, raising=raising, history=history)
         self._order = order
         self._check_params_callbacks = check_params_cbs
         self._signals_emitted: list[bool] = []  # whether the signal was already emitted
-        # maps from a unique Signal to a list of indices where to expect signal instance emits
-        self._signals_map = {}
+        self._remaining_signals = 0  # number of False entries in _signals_emitted
+        # maps from a unique Signal to a deque of the indices where signal instance emits
+        # are still expected, in increasing order
+        self._signals_map: dict[Any, deque[int]] = {}
+        # maps from an index to the unique Signal expected at that index
+        self._signal_for_index = []
         # list of all Signals (for compatibility with _AbstractSignalBlocker)
         self._signals = []
         self._slots = []  # list of slot functions
@@ -315,7 +508,8 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
         self._actual_signal_and_args_at_violation = None
         # maps from the unique Signal to the name of the signal (as string)
         self._signal_names = {}
-        self.all_signals_and_args = []  # list of SignalAndArgs instances
+        # SignalAndArgs instances (bounded by ``history``)
+        self.all_signals_and_args = _new_history(history)
 
     def add_signals(self, signals):
         """
@@ -353,11 +547,13 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
             if signal_str not in signal_str_to_unique_signal:
                 unique_signal_tuple = potential_tuple
                 signal_str_to_unique_signal[signal_str] = signal
-                self._signals_map[signal] = [index]  # create a new list
+                self._signals_map[signal] = deque([index])
+                self._signal_for_index.append(signal)
             else:
-                # append to existing list
+                # append to existing deque
                 unique_signal = signal_str_to_unique_signal[signal_str]
                 self._signals_map[unique_signal].append(index)
+                self._signal_for_index.append(unique_signal)
                 unique_signal_tuple = signals[index]
 
             self._determine_and_save_signal_name(unique_signal_tuple)
@@ -371,8 +567,8 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
             self._signal_names[unique_signal] = signal_name
 
     def _create_signal_emitted_indices(self, signals):
-        for signal in signals:
-            self._signals_emitted.append(False)
+        self._signals_emitted.extend(False for _ in signals)
+        self._remaining_signals += len(signals)
 
     def _connect_unique_signals(self):
         for unique_signal in self._signals_map:
@@ -397,12 +593,15 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
             try:
                 self._cleanup()
             finally:
-                self._loop.quit()
+                self._quit_loop()
 
     def _record_emitted_signal_if_possible(self, unique_signal, *args):
         if self._are_signal_names_available():
             self.all_signals_and_args.append(
-                SignalAndArgs(signal_name=self._signal_names[unique_signal], args=args)
+                SignalAndArgs(
+                    signal_name=self._signal_names[unique_signal],
+                    args=self._history_args(args),
+                )
             )
 
     def _check_signal_match(self, unique_signal, *args):
@@ -410,12 +609,12 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
             # perform the test for every matching index (stop after the first one that matches)
             try:
                 successful_index = self._get_first_matching_index(unique_signal, *args)
-                self._signals_emitted[successful_index] = True
+                self._mark_emitted(unique_signal, successful_index)
             except NoMatchingIndexFoundError:  # none found
                 pass
         elif self._order == "simple":
             if self._check_signal_matches_expected_index(unique_signal, *args):
-                self._signals_emitted[self._signal_expected_index] = True
+                self._mark_emitted(unique_signal, self._signal_expected_index)
                 self._signal_expected_index += 1
         else:  # self.order == "strict"
             if not self._strict_order_violated:
@@ -424,7 +623,7 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
                     True  # assume the order has been violated this time
                 )
                 if self._check_signal_matches_expected_index(unique_signal, *args):
-                    self._signals_emitted[self._signal_expected_index] = True
+                    self._mark_emitted(unique_signal, self._signal_expected_index)
                     self._signal_expected_index += 1
                     self._strict_order_violated = (
                         False  # order has not been violated after all!
@@ -432,28 +631,38 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
                 else:
                     if self._are_signal_names_available():
                         self._actual_signal_and_args_at_violation = SignalAndArgs(
-                            signal_name=self._signal_names[unique_signal], args=args
+                            signal_name=self._signal_names[unique_signal],
+                            args=self._history_args(args),
                         )
 
+    def _mark_emitted(self, unique_signal, index):
+        """Marks the signal instance expected at ``index`` as emitted."""
+        pending_indices = self._signals_map[unique_signal]
+        if pending_indices[0] == index:
+            pending_indices.popleft()
+        else:
+            pending_indices.remove(index)
+        self._signals_emitted[index] = True
+        self._remaining_signals -= 1
+
     def _all_signals_emitted(self):
-        return not self._strict_order_violated and all(self._signals_emitted)
+        return not self._strict_order_violated and self._remaining_signals == 0
 
     def _get_first_matching_index(self, unique_signal, *args):
-        successfully_emitted = False
-        successful_index = -1
-        potential_indices = self._get_unemitted_signal_indices(unique_signal)
-        for potential_index in potential_indices:
+        if not self._check_params_callbacks:
+            # without callbacks, the first pending index always matches
+            potential_indices = self._signals_map[unique_signal]
+            if not potential_indices:
+                raise NoMatchingIndexFoundError
+            return potential_indices[0]
+
+        for potential_index in self._signals_map[unique_signal]:
             if not self._violates_callback_at_index(potential_index, *args):
-                successful_index = potential_index
-                successfully_emitted = True
-                break
-        if not successfully_emitted:
-            raise NoMatchingIndexFoundError
-
-        return successful_index
+                return potential_index
+        raise NoMatchingIndexFoundError
 
     def _check_signal_matches_expected_index(self, unique_signal, *args):
-        potential_indices = self._get_unemitted_signal_indices(unique_signal)
+        potential_indices = self._signals_map[unique_signal]
         if potential_indices:
             if self._signal_expected_index == potential_indices[0]:
                 if not self._violates_callback_at_index(
@@ -475,22 +684,14 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
                     return True
         return False
 
-    def _get_unemitted_signal_indices(self, signal):
-        """Returns the indices for the provided signal for which NO signal instance has been emitted yet."""
-        return [
-            index
-            for index in self._signals_map[signal]
-            if not self._signals_emitted[index]
-        ]
-
     def _are_signal_names_available(self):
         if self._signal_names:
             return True
         return False
 
     def _get_degenerate_error_message(self):
-        received_signals = sum(self._signals_emitted)
         total_signals = len(self._signals_emitted)
+        received_signals = total_signals - self._remaining_signals
         return (
             "Received {actual} of the {total} expected signals. "
             "To improve this error message, provide the names of the signals "
@@ -555,16 +756,13 @@ class MultiSignalBlocker(_AbstractSignalBlocker):
         return signal_str_repr
 
     def _get_signal_for_index(self, index):
-        for signal in self._signals_map:
-            if index in self._signals_map[signal]:
-                return signal
+        return self._signal_for_index[index]
 
     def _cleanup(self):
-        super()._cleanup()
+        # the remaining state is kept, as it is needed to build the error message
+        # in case wait() raises TimeoutError
         for signal, slot in zip(self._signals, self._slots):
             _silent_disconnect(signal, slot)
-        del self._signals_emitted[:]
-        self._signals_map.clear()
         del self._slots[:]
 
 
@@ -603,6 +801,171 @@ class SignalEmittedSpy:
                 raise SignalEmittedError(f"Signal {self.signal!r} unexpectedly emitted")
 
 
+class RecordedSignal:
+    """
+    .. versionadded:: 4.6
+
+    Emissions of a single signal recorded by :class:`SignalRecorder`.
+
+    Arguments are recorded by a ``QSignalSpy``, so the recording itself happens in C++;
+    they are only converted to Python objects when requested with :meth:`args`, or
+    when the recording stops and the spy is released.
+
+    :ivar signal: the recorded signal.
+
+    :ivar array.array timestamps: when timestamps are enabled, the time of each emission
+        in nanoseconds since the recording started; ``None`` otherwise.
+    """
+
+    def __init__(self, signal, timestamps):
+        self.signal = signal
+        self.timestamps = array("q") if timestamps else None
+        self._spy = None
+        self._start_ns = None
+        # arguments of the emissions, copied from the spy when the recording stops
+        self._args_at_stop = None
+
+    def _start(self, start_ns):
+        self._start_ns = start_ns
+        self._spy = qt_api.QtTest.QSignalSpy(self.signal)
+        if self.timestamps is not None:
+            self.signal.connect(self._record_timestamp)
+
+    def _stop(self):
+        self._args_at_stop = [self._spy_args(n) for n in range(self._spy_count())]
+        # deleting the spy disconnects it from the signal
+        self._spy = None
+        if self.timestamps is not None:
+            _silent_disconnect(self.signal, self._record_timestamp)
+
+    def _record_timestamp(self, *args):
+        self.timestamps.append(time.perf_counter_ns() - self._start_ns)
+
+    def _spy_count(self):
+        if self._spy is None:
+            return 0
+        if qt_api.is_pyside:
+            return self._spy.count()
+        return len(self._spy)
+
+    def _spy_args(self, n):
+        if qt_api.is_pyside:
+            return list(self._spy.at(n))
+        return list(self._spy[n])
+
+    @property
+    def count(self):
+        """Number of times the signal was emitted while recording."""
+        if self._args_at_stop is not None:
+            return len(self._args_at_stop)
+        return self._spy_count()
+
+    def args(self, n):
+        """
+        Returns the arguments of the ``n``-th emission (negative values count from the
+        last emission) as a list.
+
+        :raises IndexError: if fewer emissions were recorded.
+        """
+        count = self.count
+        if n < 0:
+            n += count
+        if not 0 <= n < count:
+            raise IndexError(f"emission {n} out of range, {count} recorded")
+        if self._args_at_stop is not None:
+            return list(self._args_at_stop[n])
+        return self._spy_args(n)
+
+    def intervals(self):
+        """
+        Returns the time between consecutive emissions in milliseconds, as an
+        ``array.array`` of floats.
+
+        :raises ValueError: if the recorder was created without ``timestamps=True``.
+        """
+        if self.timestamps is None:
+            raise ValueError("intervals() requires recordSignals(..., timestamps=True)")
+        ts = self.timestamps
+        return array("d", ((b - a) / 1e6 for a, b in zip(ts, ts[1:])))
+
+
+class SignalRecorder:
+    """
+    .. versionadded:: 4.6
+
+    Returned by :meth:`pytestqt.qtbot.QtBot.recordSignals`, records every emission
+    of the given signals.
+
+    Intended to be used as a context manager; the recording for each signal is accessed
+    by indexing the recorder with the signal itself or its position, returning a
+    :class:`RecordedSignal`.
+
+    :ivar float duration: duration of the recording in seconds, so far.
+
+    .. automethod:: rate
+    """
+
+    def __init__(self, signals, *, timestamps=False):
+        self._recordings = []
+        self._recording_for_signal = {}
+        for signal in signals:
+            recording = RecordedSignal(signal, timestamps)
+            self._recordings.append(recording)
+            self._recording_for_signal.setdefault(str(signal), recording)
+        self._start_ns = None
+        self._stop_ns = None
+
+    def start(self):
+        """Starts recording; called automatically when entering the ``with`` block."""
+        self._start_ns = time.perf_counter_ns()
+        for recording in self._recordings:
+            recording._start(self._start_ns)
+
+    def stop(self):
+        """Stops recording; called automatically when leaving the ``with`` block."""
+        for recording in self._recordings:
+            recording._stop()
+        self._stop_ns = time.perf_counter_ns()
+
+    @property
+    def duration(self):
+        if self._start_ns is None:
+            return 0.0
+        stop_ns = self._stop_ns if self._stop_ns is not None else time.perf_counter_ns()
+        return (stop_ns - self._start_ns) / 1e9
+
+    def rate(self, key):
+        """
+        Returns the average number of emissions per second of the given signal
+        over the recording.
+        """
+        duration = self.duration
+        if not duration:
+            return 0.0
+        return self[key].count / duration
+
+    def __getitem__(self, key):
+        if isinstance(key, int):
+            return self._recordings[key]
+        try:
+            return self._recording_for_signal[str(key)]
+        except KeyError:
+            raise KeyError(f"signal {key!r} is not being recorded") from None
+
+    def __iter__(self):
+        return iter(self._recordings)
+
+    def __len__(self):
+        return len(self._recordings)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+
 class CallbackBlocker:
     """
     .. versionadded:: 3.1
@@ -636,13 +999,7 @@ class CallbackBlocker:
         self.args = None
         self.kwargs = None
         self.called = False
-        self._loop = qt_api.QtCore.QEventLoop()
-
-        self._timer = qt_api.QtCore.QTimer(self._loop)
-        self._timer.setSingleShot(True)
-        if timeout is not None:
-            self._timer.setInterval(timeout)
-        self._timer.timeout.connect(self._quit_loop_by_timeout)
+        self._loop = None  # obtained from _event_loop_pool only while waiting
 
     def wait(self):
         """
@@ -652,9 +1009,7 @@ class CallbackBlocker:
         __tracebackhide__ = True
         if self.called:
             return
-        if self.timeout is not None:
-            self._timer.start()
-        qt_api.exec(self._loop)
+        _exec_event_loop(self, lambda: self.called)
         if not self.called and self.raising:
             raise TimeoutError("Callback wasn't called after %sms." % self.timeout)
 
@@ -667,14 +1022,13 @@ class CallbackBlocker:
         assert self.args == list(args)
         assert self.kwargs == kwargs
 
-    def _quit_loop_by_timeout(self):
-        try:
-            self._cleanup()
-        finally:
-            self._loop.quit()
+    def _quit_loop(self):
+        loop = self._loop
+        if loop is not None:
+            loop.quit()
 
-    def _cleanup(self):
-        self._timer.stop()
+    def _quit_loop_by_timeout(self):
+        self._quit_loop()
 
     def __call__(self, *args, **kwargs):
         # Not inside the try: block, as if self.called is True, we did quit the
@@ -685,9 +1039,8 @@ class CallbackBlocker:
             self.args = list(args)
             self.kwargs = kwargs
             self.called = True
-            self._cleanup()
         finally:
-            self._loop.quit()
+            self._quit_loop()
 
     def __enter__(self):
         return self
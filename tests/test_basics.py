@@ -1,3 +1,4 @@
+import time
 import weakref
 
 import pytest
@@ -291,6 +292,233 @@ def test_event_processing_before_and_after_teardown(testdir):
     res.stdout.fnmatch_lines(["*3 passed in*"])
 
 
+def test_qt_modules_imported_lazily(testdir):
+    """
+    Only QtCore is imported when pytest-qt is configured, the other Qt modules
+    being imported when first accessed, with the import time shown with -v.
+    """
+    testdir.makepyfile("""
+        import sys
+
+        import pytest
+        from pytestqt.qt_compat import qt_api, QT_APIS
+
+        def test_lazy():
+            root = QT_APIS[qt_api.pytest_qt_api]
+            assert root + ".QtCore" in sys.modules
+            assert root + ".QtWidgets" not in sys.modules
+            assert root + ".QtNetwork" not in sys.modules
+
+            assert qt_api.QtWidgets is sys.modules[root + ".QtWidgets"]
+            assert qt_api.QtNetwork is sys.modules[root + ".QtNetwork"]
+            assert qt_api.QtNetwork.QTcpSocket
+
+            with pytest.raises(AttributeError):
+                qt_api.QtDoesNotExist
+            with pytest.raises(AttributeError):
+                qt_api.does_not_exist
+    """)
+    result = testdir.runpytest_subprocess("-v")
+    result.stdout.fnmatch_lines(
+        [
+            "*::test_lazy PASSED*",
+            "Qt modules import time: QtCore *ms, QtWidgets *ms, QtNetwork *ms",
+            "*= 1 passed in *",
+        ]
+    )
+    result = testdir.runpytest_subprocess()
+    result.stdout.no_fnmatch_line("Qt modules import time: *")
+
+
+def test_qt_modules_imported_eagerly(testdir):
+    """
+    With qt_lazy_imports = false, QtGui, QtWidgets and QtTest are imported when
+    pytest-qt is configured.
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_lazy_imports = false
+    """)
+    testdir.makepyfile("""
+        import sys
+
+        from pytestqt.qt_compat import qt_api, QT_APIS
+
+        def test_eager():
+            root = QT_APIS[qt_api.pytest_qt_api]
+            for name in ["QtCore", "QtGui", "QtWidgets", "QtTest"]:
+                assert root + "." + name in sys.modules
+            assert root + ".QtNetwork" not in sys.modules
+    """)
+    result = testdir.runpytest_subprocess()
+    result.stdout.fnmatch_lines(["*= 1 passed in *"])
+
+
+@pytest.mark.parametrize("only_qt_tests", [True, False])
+def test_qt_only_qt_tests(testdir, only_qt_tests):
+    """
+    With the qt_only_qt_tests ini option, exceptions and Qt messages are only
+    captured for tests using Qt fixtures or the qt mark.
+    """
+    testdir.makeini(f"""
+        [pytest]
+        qt_only_qt_tests = {only_qt_tests}
+    """)
+    testdir.makepyfile(f"""
+        import sys
+
+        import pytest
+
+        def is_captured(request):
+            return hasattr(request.node, "qt_log_capture") and (
+                sys.excepthook is not sys.__excepthook__
+            )
+
+        def test_pure_python(request):
+            assert is_captured(request) is {not only_qt_tests}
+
+        def test_qtbot(qtbot, request):
+            assert is_captured(request)
+
+        def test_qtlog(qtlog, request):
+            assert is_captured(request)
+
+        @pytest.mark.qt
+        def test_mark(request):
+            assert is_captured(request)
+    """)
+    result = testdir.runpytest_inprocess()
+    result.stdout.fnmatch_lines(["*= 4 passed in *"])
+
+
+def test_item_config(testdir):
+    """
+    The ini options and marks of each item are resolved once, during collection.
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_level_fail = CRITICAL
+        qt_log_ignore = foo.*
+        qt_default_raising = false
+    """)
+    testdir.makeconftest("""
+        def pytest_collection_finish(session):
+            assert all(hasattr(item, "qt_item_config") for item in session.items)
+    """)
+    testdir.makepyfile("""
+        import dataclasses
+
+        import pytest
+
+        def test_default(request):
+            config = request.node.qt_item_config
+            assert config.enabled
+            assert config.exception_capture
+            assert config.log_capture
+            assert not config.default_raising
+            assert config.log_fail_level == "CRITICAL"
+            assert config.log_ignore_regexes == ("foo.*",)
+            assert config.log_is_ignored("foo bar")
+            assert not config.log_is_ignored("bar")
+            with pytest.raises(dataclasses.FrozenInstanceError):
+                config.enabled = False
+
+        @pytest.mark.qt_no_exception_capture
+        @pytest.mark.no_qt_log
+        @pytest.mark.qt_log_level_fail("WARNING")
+        @pytest.mark.qt_log_ignore("bar.*", extend=False)
+        def test_marks(request):
+            config = request.node.qt_item_config
+            assert not config.exception_capture
+            assert not config.log_capture
+            assert config.log_fail_level == "WARNING"
+            assert config.log_ignore_regexes == ("bar.*",)
+    """)
+    result = testdir.runpytest_inprocess()
+    result.stdout.fnmatch_lines(["*= 2 passed in *"])
+
+
+@pytest.mark.parametrize(
+    "ini, check, properties",
+    [
+        ("", "chain.remaining > 0", []),
+        ("qt_event_drain = single", "chain.remaining > 0", []),
+        (
+            "qt_event_drain = until-idle",
+            "chain.remaining == 0",
+            ["qt_events_drained", 'qt_events_pending" value="0"'],
+        ),
+        (
+            "qt_event_drain = until-idle\nqt_event_drain_max_iterations = 2",
+            "chain.remaining > 0",
+            ['qt_events_pending" value="1"'],
+        ),
+        ("qt_event_drain = none", "chain.remaining == 50", []),
+    ],
+)
+def test_event_drain(testdir, ini, check, properties):
+    """
+    Test the qt_event_drain policies, using an object which posts a chain of
+    50 events to itself.
+    """
+    testdir.makeini("[pytest]\n" + ini)
+    testdir.makepyfile(f"""
+        from pytestqt.qt_compat import qt_api
+
+        QEvent = qt_api.QtCore.QEvent
+
+        class Chain(qt_api.QtCore.QObject):
+            def __init__(self, n):
+                super().__init__()
+                self.remaining = n
+
+            def event(self, ev):
+                if ev.type() == QEvent.Type.User:
+                    self.remaining -= 1
+                    if self.remaining:
+                        qt_api.QtCore.QCoreApplication.postEvent(
+                            self, QEvent(QEvent.Type.User)
+                        )
+                    return True
+                return super().event(ev)
+
+        chain = None
+
+        def test_post(qapp):
+            global chain
+            chain = Chain(50)
+            qapp.postEvent(chain, QEvent(QEvent.Type.User))
+
+        def test_check():
+            assert {check}
+    """)
+    result = testdir.runpytest_inprocess("--junitxml=junit.xml")
+    result.stdout.fnmatch_lines(["*= 2 passed in *"])
+    junit = testdir.tmpdir.join("junit.xml").read()
+    for prop in properties:
+        assert prop in junit
+    if not properties:
+        assert "qt_events" not in junit
+
+
+def test_event_drain_invalid(testdir):
+    testdir.makeini("""
+        [pytest]
+        qt_event_drain = always
+    """)
+    testdir.makepyfile("""
+        def test_foo():
+            pass
+    """)
+    result = testdir.runpytest_inprocess()
+    result.stdout.fnmatch_lines(
+        [
+            "*ValueError: Invalid value for qt_event_drain: 'always', expected one of *",
+            "*= 1 error in *",
+        ]
+    )
+
+
 def test_header(testdir, monkeypatch):
     monkeypatch.setattr(
         qt_api,
@@ -355,6 +583,14 @@ def test_qtbot_wait(qtbot, stop_watch):
     assert stop_watch.elapsed >= 220
 
 
+def test_qtbot_wait_zero(qtbot):
+    """qtbot.wait(0) processes pending events without blocking."""
+    called = []
+    qt_api.QtCore.QTimer.singleShot(0, lambda: called.append(1))
+    qtbot.wait(0)
+    assert called
+
+
 @pytest.fixture
 def event_recorder(qtbot):
     class EventRecorder(qt_api.QtWidgets.QWidget):
@@ -549,6 +785,58 @@ def test_importerror(monkeypatch):
         qt_api.set_qt_api(api=None)
 
 
+def test_qt_api_cache(monkeypatch):
+    """
+    The api guessed when none is configured is stored in pytest's cache, and
+    reused by the next runs in the same environment without trying to import
+    each library.
+    """
+
+    class FakeCache(dict):
+        def set(self, key, value):
+            self[key] = value
+
+    # set_qt_api() changes the global qt_api, which is restored after the test
+    for name, value in list(vars(qt_api).items()):
+        monkeypatch.setattr(qt_api, name, value)
+    monkeypatch.setattr(qt_api, "_import_times", dict(qt_api._import_times))
+
+    # the api of the session (pytest_qt_api might have been reset by other tests),
+    # guessed without trying to import each library
+    root_module = qt_api.QtCore.__name__.rpartition(".")[0]
+    api = {module: api for api, module in qt_compat.QT_APIS.items()}[root_module]
+    guesses = []
+
+    def _guess_qt_api():
+        guesses.append(True)
+        return api
+
+    monkeypatch.delenv("PYTEST_QT_API", raising=False)
+    monkeypatch.setattr(qt_compat, "_is_library_loaded", lambda name: False)
+    monkeypatch.setattr(qt_api, "_guess_qt_api", _guess_qt_api)
+
+    cache = FakeCache()
+    qt_api.set_qt_api(None, cache=cache)
+    assert qt_api.pytest_qt_api == api
+    assert cache[qt_compat._CACHE_KEY]["api"] == api
+    assert len(guesses) == 1
+
+    qt_api.set_qt_api(None, cache=cache)
+    assert qt_api.pytest_qt_api == api
+    assert len(guesses) == 1
+
+    qt_api.set_qt_api(None, cache=cache, rescan=True)
+    assert qt_api.pytest_qt_api == api
+    assert len(guesses) == 2
+
+    # installing or removing packages invalidates the cached api
+    cache[qt_compat._CACHE_KEY]["fingerprint"] = "other environment"
+    qt_api.set_qt_api(None, cache=cache)
+    assert qt_api.pytest_qt_api == api
+    assert len(guesses) == 3
+    assert cache[qt_compat._CACHE_KEY]["fingerprint"] != "other environment"
+
+
 @pytest.mark.parametrize(
     "option_api, backend",
     [
@@ -584,6 +872,10 @@ def test_already_loaded_backend(monkeypatch, option_api, backend):
         qtcore.Slot = object()
         qtcore.Property = object()
 
+    qcoreapplication = Mock()
+    qcoreapplication.instance = lambda *_: None
+    qtcore.QCoreApplication = qcoreapplication
+
     qtwidgets = Mock()
     qapplication = Mock()
     qapplication.instance = lambda *_: None
@@ -644,6 +936,109 @@ def test_before_close_func(testdir):
     assert sys.pytest_qt_widget_closed
 
 
+@pytest.mark.parametrize("record", [True, False])
+def test_widgets_deleted_after_test(testdir, record):
+    """
+    Widgets added by "qtbot.add_widget" are deleted after the test, even though
+    processEvents() does not process DeferredDelete events outside of an event
+    loop, and the number of deleted widgets is recorded in the user properties
+    when enabled.
+    """
+    if record:
+        testdir.makeini("""
+            [pytest]
+            qt_record_deleted_widgets = true
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        # keeps the python wrappers alive, which would otherwise delete the widgets
+        kept = []
+        destroyed = []
+
+        def test_create(qtbot):
+            w = qt_api.QtWidgets.QWidget()
+            kept.append(w)
+            label = qt_api.QtWidgets.QLabel(w)
+            kept.append(label)
+            label.destroyed.connect(lambda: destroyed.append("label"))
+            w.destroyed.connect(lambda: destroyed.append("w"))
+            qtbot.add_widget(w)
+
+        def test_deleted(qtbot):
+            assert destroyed == ["w", "label"]
+    """)
+    result = testdir.runpytest_inprocess("--junitxml=junit.xml")
+    result.stdout.fnmatch_lines(["*= 2 passed in *"])
+    junit = testdir.tmpdir.join("junit.xml").read()
+    if record:
+        assert '<property name="qt_deleted_widgets" value="1" />' in junit
+    else:
+        assert "qt_deleted_widgets" not in junit
+
+
+def test_widgets_deleted_after_fixtures(testdir):
+    """
+    Widgets added by "qtbot.add_widget" are closed before the fixtures are torn
+    down, but only deleted afterwards, so finalizers can still use them.
+    """
+    testdir.makepyfile("""
+        import pytest
+        from pytestqt.qt_compat import qt_api
+
+        @pytest.fixture
+        def widget(qtbot):
+            w = qt_api.QtWidgets.QWidget()
+            w.setObjectName("my widget")
+            qtbot.add_widget(w)
+            yield w
+            assert not w.isVisible()
+            assert w.objectName() == "my widget"
+
+        def test_show(widget):
+            widget.show()
+    """)
+    result = testdir.runpytest_inprocess()
+    result.stdout.fnmatch_lines(["*= 1 passed in *"])
+
+
+def test_widgets_not_deleted_after_test(testdir):
+    """
+    Deleting the registered widgets stops as soon as sending the posted
+    DeferredDelete events doesn't delete any of them, instead of trying again
+    until qt_teardown_timeout elapsed.
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_teardown_timeout = 60000
+    """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        kept = []
+
+        class BlockDeferredDelete(qt_api.QtCore.QObject):
+            def eventFilter(self, obj, event):
+                return event.type() == qt_api.QtCore.QEvent.Type.DeferredDelete
+
+        def test_create(qtbot):
+            w = qt_api.QtWidgets.QWidget()
+            event_filter = BlockDeferredDelete()
+            w.installEventFilter(event_filter)
+            kept.extend([w, event_filter])
+            qtbot.add_widget(w)
+
+        def test_not_deleted(qtbot):
+            w, event_filter = kept
+            w.removeEventFilter(event_filter)
+            assert w.isHidden()
+    """)
+    start = time.monotonic()
+    result = testdir.runpytest_inprocess()
+    result.stdout.fnmatch_lines(["*= 2 passed in *"])
+    assert time.monotonic() - start < 30
+
+
 def test_addwidget_typeerror(testdir, qtbot):
     """
     Make sure addWidget catches type errors early.
@@ -148,6 +148,37 @@ def test_no_capture(testdir, no_capture_by_marker):
     res.stdout.fnmatch_lines(["*1 passed*"])
 
 
+@pytest.mark.parametrize("apply_marker", [True, False])
+def test_no_capture_marker_applied_by_fixture(testdir, apply_marker):
+    """
+    A qt_no_exception_capture mark applied by a fixture disables the exception
+    capture for the test too.
+
+    :type testdir: TmpTestdir
+    """
+    testdir.makepyfile(f"""
+        import sys
+
+        import pytest
+
+        @pytest.fixture
+        def no_capture(request):
+            if {apply_marker}:
+                request.applymarker(pytest.mark.qt_no_exception_capture)
+
+        def test_error(qtbot, no_capture):
+            try:
+                raise RuntimeError("unhandled error")
+            except RuntimeError:
+                sys.excepthook(*sys.exc_info())
+        """)
+    res = testdir.runpytest()
+    if apply_marker:
+        res.stdout.fnmatch_lines(["*1 passed*"])
+    else:
+        res.stdout.fnmatch_lines(["*RuntimeError: unhandled error", "*1 failed*"])
+
+
 def test_no_capture_preserves_custom_excepthook(testdir):
     """
     Capturing must leave custom excepthooks alone when disabled.
@@ -384,3 +415,213 @@ def test_exceptions_dont_leak(testdir):
     """)
     result = testdir.runpytest()
     result.stdout.fnmatch_lines(["*1 failed, 1 passed*"])
+
+
+@pytest.mark.parametrize(
+    "wait",
+    [
+        "qtbot.waitSignal(obj.destroyed, timeout=20000)",
+        "qtbot.waitCallback(timeout=20000)",
+        "qtbot.waitUntil(lambda: False, timeout=20000)",
+        "qtbot.wait(20000)",
+    ],
+)
+def test_exception_aborts_wait(testdir, stop_watch, wait):
+    """
+    Waits in progress are aborted as soon as an exception is captured, failing
+    the test right away instead of after the timeout.
+    """
+    testdir.makepyfile(f"""
+        import contextlib
+        from pytestqt.qt_compat import qt_api
+
+        def raise_error():
+            raise RuntimeError("error in slot")
+
+        def test_wait(qtbot):
+            obj = qt_api.QtCore.QObject()
+            qt_api.QtCore.QTimer.singleShot(10, raise_error)
+            blocker = {wait}
+            if blocker is not None:
+                with blocker:
+                    pass
+            assert False, "should not get here"
+    """)
+    stop_watch.start()
+    result = testdir.runpytest()
+    stop_watch.stop()
+    result.stdout.fnmatch_lines(
+        [
+            "*CALL ERROR: Exceptions caught in Qt event loop:*",
+            "*RuntimeError: error in slot*",
+            "*1 failed*",
+        ]
+    )
+    assert "should not get here" not in result.stdout.str()
+    assert stop_watch.elapsed < 10_000
+
+
+def test_repeated_exceptions_are_deduplicated(testdir):
+    """
+    Identical exceptions captured during a test are only reported once, with
+    their count, and at most MAX_DEFERRED_EXCEPTIONS distinct exceptions are shown.
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        class Emitter(qt_api.QtCore.QObject):
+            signal = qt_api.Signal(int)
+
+        def raise_error(i):
+            raise RuntimeError(f"error {i}")
+
+        def test_exceptions(qtbot):
+            emitter = Emitter()
+            emitter.signal.connect(raise_error)
+            for i in range(100):
+                emitter.signal.emit(0)
+            for i in range(1, 15):
+                emitter.signal.emit(i)
+    """)
+    result = testdir.runpytest()
+    result.stdout.fnmatch_lines(
+        [
+            "*CALL ERROR: Exceptions caught in Qt event loop:*",
+            "*RuntimeError: error 0",
+            "(raised 100 times)",
+            "*RuntimeError: error 9",
+            "5 more exceptions not shown",
+            "*1 failed*",
+        ]
+    )
+    assert result.stdout.str().count("RuntimeError: error 0") == 1
+    assert "RuntimeError: error 10" not in result.stdout.str()
+
+
+@pytest.mark.parametrize("thread_class", ["threading.Thread", "QThread"])
+def test_exception_in_thread_aborts_wait(testdir, stop_watch, thread_class):
+    """
+    Exceptions raised in Python threads and QThreads are captured, attributed
+    to their thread, and abort the waits in progress.
+    """
+    testdir.makepyfile(f"""
+        import threading
+        from pytestqt.qt_compat import qt_api
+
+        class Loader(qt_api.QtCore.QThread):
+            loaded = qt_api.Signal()
+
+            def run(self):
+                raise RuntimeError("error in loader")
+
+        def run():
+            raise RuntimeError("error in loader")
+
+        def test_thread(qtbot):
+            if "{thread_class}" == "QThread":
+                thread = Loader()
+                thread.setObjectName("loader")
+            else:
+                thread = threading.Thread(target=run, name="loader")
+            never_emitted = Loader()
+            with qtbot.waitSignal(never_emitted.loaded, timeout=20000):
+                thread.start()
+            assert False, "should not get here"
+    """)
+    stop_watch.start()
+    result = testdir.runpytest()
+    stop_watch.stop()
+    result.stdout.fnmatch_lines(
+        [
+            "*CALL ERROR: Exceptions caught in Qt event loop:*",
+            "Exception in thread *",
+            "*RuntimeError: error in loader*",
+            "*1 failed*",
+        ]
+    )
+    assert "should not get here" not in result.stdout.str()
+    assert stop_watch.elapsed < 10_000
+
+
+def test_capture_exceptions_in_threads(qapp):
+    """capture_exceptions() also captures exceptions from Python threads."""
+    import threading
+
+    def run():
+        raise ValueError("error in thread")
+
+    with capture_exceptions() as exceptions:
+        thread = threading.Thread(target=run, name="worker")
+        thread.start()
+        thread.join()
+    assert len(exceptions) == 1
+    exc_type, value, _tb = exceptions[0]
+    assert exc_type is ValueError
+    assert str(value) == "error in thread"
+    del exceptions[:]
+
+
+def test_unraisable_exception(testdir):
+    """Unraisable exceptions (for example, raised in __del__) are captured."""
+    testdir.makepyfile("""
+        import gc
+
+        class Resource:
+            def __del__(self):
+                raise RuntimeError("error in __del__")
+
+        def test_unraisable(qtbot):
+            Resource()
+            gc.collect()
+    """)
+    result = testdir.runpytest()
+    result.stdout.fnmatch_lines(
+        [
+            "*CALL ERROR: Exceptions caught in Qt event loop:*",
+            "Exception ignored *Resource*",
+            "*RuntimeError: error in __del__*",
+            "*1 failed*",
+        ]
+    )
+
+
+def test_exception_before_wait_aborts_wait(testdir):
+    """An exception captured before a wait starts makes the wait fail immediately."""
+    testdir.makepyfile("""
+        import pytest
+        from pytestqt.qt_compat import qt_api
+
+        def test_wait(qtbot):
+            def raise_error():
+                raise RuntimeError("early error")
+
+            qt_api.QtCore.QTimer.singleShot(0, raise_error)
+            qtbot.wait(0)
+            pytest.fail("should not get here")
+    """)
+    result = testdir.runpytest()
+    result.stdout.fnmatch_lines(["*RuntimeError: early error*", "*1 failed*"])
+    assert "should not get here" not in result.stdout.str()
+
+
+def test_exception_in_setup_aborts_wait(testdir):
+    testdir.makepyfile("""
+        import pytest
+        from pytestqt.qt_compat import qt_api
+
+        def raise_error():
+            raise RuntimeError("error in fixture")
+
+        @pytest.fixture
+        def fix(qtbot):
+            qt_api.QtCore.QTimer.singleShot(10, raise_error)
+            with qtbot.waitCallback(timeout=20000):
+                pass
+
+        def test_foo(fix):
+            pass
+    """)
+    result = testdir.runpytest()
+    result.stdout.fnmatch_lines(
+        ["*SETUP ERROR: Exceptions caught in Qt event loop:*", "*1 error*"]
+    )
@@ -1,4 +1,5 @@
 import datetime
+import json
 
 import pytest
 
@@ -88,6 +89,571 @@ def test_qtlog_fixture(qtlog):
         qtlog.records = []
 
 
+def test_qtlog_records(qtlog):
+    """
+    Test the attributes of the captured records.
+    """
+    before = datetime.datetime.now()
+    for i in range(2):
+        qt_api.qWarning(f"message {i}")
+    after = datetime.datetime.now()
+
+    first, second = qtlog.records
+    for rec in (first, second):
+        assert rec.type_name == "QtWarningMsg"
+        assert rec.log_type_name == "WARNING"
+        assert before - datetime.timedelta(seconds=1) <= rec.when
+        assert rec.when <= after + datetime.timedelta(seconds=1)
+        assert not hasattr(rec, "__dict__")
+    assert first.timestamp_ns <= second.timestamp_ns
+    # messages emitted from the same location share their context
+    assert first.context is second.context
+
+
+@pytest.mark.parametrize(
+    "level, expected",
+    [
+        ("NO", []),
+        ("CRITICAL", ["CRITICAL"]),
+        ("WARNING", ["WARNING", "CRITICAL"]),
+        ("DEBUG", ["DEBUG", "WARNING", "CRITICAL"]),
+        ("INFO", ["INFO", "DEBUG", "WARNING", "CRITICAL"]),
+    ],
+)
+def test_record_matches_level(level, expected):
+    from pytestqt.logging import Record
+
+    QtMsgType = qt_api.QtCore.QtMsgType
+    records = [
+        Record(QtMsgType.QtInfoMsg, "info", False, None),
+        Record(QtMsgType.QtDebugMsg, "debug", False, None),
+        Record(QtMsgType.QtWarningMsg, "warning", False, None),
+        Record(QtMsgType.QtCriticalMsg, "critical", False, None),
+    ]
+    matching = [rec.log_type_name for rec in records if rec.matches_level(level)]
+    assert matching == expected
+
+
+@pytest.mark.parametrize("mode", ["ini", "mark"])
+def test_logging_capture_level(testdir, mode):
+    """
+    Messages below qt_log_capture_level are not captured, and the logging rules
+    set by the application are left untouched.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    ini = "qt_log_capture_level = WARNING" if mode == "ini" else ""
+    mark = "@pytest.mark.qt_log_capture_level('WARNING')" if mode == "mark" else ""
+    testdir.makeini(f"""
+        [pytest]
+        {ini}
+        """)
+    testdir.makepyfile(f"""
+        from pytestqt.qt_compat import qt_api
+        import pytest
+
+        @pytest.fixture(scope='session', autouse=True)
+        def logging_rules():
+            qt_api.QtCore.QLoggingCategory.setFilterRules('myapp.warning=false')
+            yield
+            qt_api.QtCore.QLoggingCategory.setFilterRules('')
+
+        {mark}
+        def test_1(qtlog):
+            qt_api.qDebug('debug message')
+            qt_api.qWarning('warning message')
+            qt_api.qCritical('critical message')
+            assert [rec.message for rec in qtlog.records] == [
+                'warning message',
+                'critical message',
+            ]
+            category = qt_api.QtCore.QLoggingCategory('myapp')
+            assert not category.isWarningEnabled()
+
+        def test_2(qtlog):
+            category = qt_api.QtCore.QLoggingCategory('myapp')
+            assert not category.isWarningEnabled()
+        """)
+    res = testdir.inline_run()
+    res.assertoutcome(passed=2)
+
+
+def test_logging_capture_level_below_fail_level(testdir):
+    """
+    Messages which make the test fail are captured even if they are below
+    qt_log_capture_level.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_capture_level = CRITICAL
+        qt_log_level_fail = WARNING
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            qt_api.qDebug('debug message')
+            qt_api.qWarning('warning message')
+        """)
+    res = testdir.runpytest()
+    res.stdout.fnmatch_lines(
+        [
+            "*Failure: Qt messages with level WARNING or above emitted*",
+            "*QtWarningMsg: warning message*",
+            "*1 failed*",
+        ]
+    )
+    res.stdout.no_fnmatch_line("*debug message*")
+
+
+def test_logging_max_records(testdir):
+    """
+    With qt_log_max_records, only the first and last messages are kept, and
+    the number of dropped messages is shown in the report.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_max_records = 5
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1(qtlog):
+            for i in range(10):
+                qt_api.qDebug(f'message {i}')
+            qt_api.qWarning('message 10')
+            messages = [rec.message for rec in qtlog.iter_records()]
+            assert messages == [
+                'message 0', 'message 1', 'message 8', 'message 9', 'message 10'
+            ]
+            assert [rec.message for rec in qtlog.records] == messages
+            assert qtlog.dropped_counts == {'DEBUG': 6}
+            assert 0
+        """)
+    res = testdir.runpytest()
+    res.stdout.fnmatch_lines(
+        [
+            "*Captured Qt messages*",
+            "*QtDebugMsg: message 1",
+            "... 6 messages dropped (DEBUG: 6) ...",
+            "*QtDebugMsg: message 8",
+            "*1 failed*",
+        ]
+    )
+
+
+def test_logging_max_records_dropped_failure(testdir):
+    """
+    A dropped message still makes the test fail.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_max_records = 2
+        qt_log_level_fail = CRITICAL
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            qt_api.qDebug('message 0')
+            qt_api.qCritical('critical message')
+            for i in range(5):
+                qt_api.qDebug(f'message {i}')
+        """)
+    res = testdir.runpytest()
+    res.stdout.fnmatch_lines(
+        [
+            "*Failure: Qt messages with level CRITICAL or above emitted*",
+            "... 5 messages dropped (CRITICAL: 1, DEBUG: 4) ...",
+            "*1 failed*",
+        ]
+    )
+
+
+def test_qtlog_queries(qtlog):
+    """
+    Test qtlog.by_level, qtlog.by_category and qtlog.count.
+    """
+    qt_api.qDebug("debug message")
+    qt_api.qWarning("warning message")
+    assert [rec.message for rec in qtlog.by_level("WARNING")] == ["warning message"]
+    # indices are kept up to date after they are built
+    qt_api.qWarning("another warning message")
+    qt_api.qCritical("critical message")
+
+    assert [rec.message for rec in qtlog.by_level("WARNING")] == [
+        "warning message",
+        "another warning message",
+    ]
+    assert qtlog.by_level("INFO") == []
+    assert qtlog.count() == 4
+    assert qtlog.count("WARNING") == 2
+    assert qtlog.count("FATAL") == 0
+
+    category = qtlog.records[0].context.category
+    assert len(qtlog.by_category(category)) == 4
+    assert qtlog.by_category("qt.unknown") == []
+    assert qtlog.count(category=category) == 4
+    assert qtlog.count("CRITICAL", category) == 1
+
+
+def test_qtlog_queries_max_records(testdir):
+    """
+    The qtlog indices only contain the records which were not dropped because
+    of qt_log_max_records.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_max_records = 4
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1(qtlog):
+            qt_api.qWarning('message 0')
+            assert qtlog.count('WARNING') == 1
+            for i in range(1, 10):
+                if i % 2:
+                    qt_api.qDebug(f'message {i}')
+                else:
+                    qt_api.qWarning(f'message {i}')
+            expected = [rec.message for rec in qtlog.records]
+            assert expected == ['message 0', 'message 1', 'message 8', 'message 9']
+            assert [rec.message for rec in qtlog.by_level('WARNING')] == [
+                'message 0',
+                'message 8',
+            ]
+            assert [rec.message for rec in qtlog.by_level('DEBUG')] == [
+                'message 1',
+                'message 9',
+            ]
+        """)
+    res = testdir.inline_run()
+    res.assertoutcome(passed=1)
+
+
+@pytest.mark.parametrize("from_thread", [False, True])
+def test_qtlog_wait_for_message(qtlog, qtbot, from_thread):
+    """
+    Test qtlog.waitForMessage with messages emitted later from the main thread
+    or from another thread.
+    """
+    import threading
+
+    def emit():
+        qt_api.qWarning("unrelated message")
+        qt_api.qWarning("server started on port 1234")
+
+    if from_thread:
+        thread = threading.Thread(target=emit)
+        qt_api.QtCore.QTimer.singleShot(10, thread.start)
+    else:
+        qt_api.QtCore.QTimer.singleShot(10, emit)
+    rec = qtlog.waitForMessage(r"started on port \d+", timeout=5000)
+    assert rec.message == "server started on port 1234"
+    if from_thread:
+        thread.join()
+
+    # messages captured before the call are also found
+    assert qtlog.wait_for_message("unrelated") is qtlog.records[0]
+
+
+def test_qtlog_wait_for_message_timeout(qtlog, qtbot):
+    qt_api.qWarning("unrelated message")
+    with pytest.raises(
+        qtbot.TimeoutError,
+        match="No Qt message matching 'started' was captured after 50ms",
+    ):
+        qtlog.waitForMessage("started", timeout=50)
+    assert qtlog._message_waiters == []
+
+
+def test_logging_file(testdir):
+    """
+    Test --qt-log-file option.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            qt_api.qDebug('debug message')
+            qt_api.qWarning('warning message')
+
+        def test_2():
+            qt_api.qCritical('critical message')
+        """)
+    res = testdir.runpytest("--qt-log-file=qt-log.jsonl")
+    res.assert_outcomes(passed=2)
+
+    with open(testdir.tmpdir / "qt-log.jsonl", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [(e["nodeid"], e["level"], e["message"]) for e in entries] == [
+        ("test_logging_file.py::test_1", "DEBUG", "debug message"),
+        ("test_logging_file.py::test_1", "WARNING", "warning message"),
+        ("test_logging_file.py::test_2", "CRITICAL", "critical message"),
+    ]
+    for entry in entries:
+        assert set(entry) == {
+            "nodeid",
+            "level",
+            "category",
+            "file",
+            "line",
+            "time_ms",
+            "message",
+        }
+        assert entry["time_ms"] >= 0
+    assert entries[0]["time_ms"] <= entries[1]["time_ms"]
+
+
+def test_logging_file_xdist_worker(testdir, monkeypatch):
+    """
+    Each pytest-xdist worker writes to its own --qt-log-file.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            qt_api.qWarning('warning message')
+        """)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    res = testdir.runpytest("--qt-log-file=qt-log.jsonl")
+    res.assert_outcomes(passed=1)
+
+    assert not (testdir.tmpdir / "qt-log.jsonl").exists()
+    with open(testdir.tmpdir / "qt-log.gw1.jsonl", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert [e["message"] for e in entries] == ["warning message"]
+
+
+@pytest.mark.parametrize("arg", ["-s", "--capture=no", "--no-qt-log"])
+def test_logging_file_and_summary_without_capture(testdir, arg):
+    """
+    --qt-log-file and --qt-log-summary are ignored with a warning when the Qt
+    messages are not captured.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            qt_api.qWarning('warning message')
+        """)
+    res = testdir.runpytest(arg, "--qt-log-file=qt-log.jsonl", "--qt-log-summary=3")
+    res.stdout.fnmatch_lines(
+        [
+            "*PytestConfigWarning: --qt-log-file and --qt-log-summary ignored: Qt "
+            "messages are not captured with -s, --capture=no or --no-qt-log",
+            "*1 passed*",
+        ]
+    )
+    assert not (testdir.tmpdir / "qt-log.jsonl").exists()
+
+
+def test_logging_summary(testdir):
+    """
+    Test --qt-log-summary option.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            for i in range(3):
+                qt_api.qWarning('warning message')
+
+        def test_2():
+            qt_api.qDebug('debug message')
+
+        def test_3():
+            pass
+        """)
+    res = testdir.runpytest("--qt-log-summary=1")
+    res.stdout.fnmatch_lines(
+        [
+            "*= Qt messages summary =*",
+            "4 Qt messages captured",
+            "by level: DEBUG: 1, WARNING: 3",
+            "top categories (of 1):",
+            "         4 default",
+            "top tests (of 2):",
+            "         3 test_logging_summary.py::test_1",
+            "*3 passed*",
+        ]
+    )
+    res.stdout.no_fnmatch_line("*test_logging_summary.py::test_2")
+
+    res = testdir.runpytest()
+    res.stdout.no_fnmatch_line("*Qt messages summary*")
+
+
+def test_logging_report_repeated_messages(testdir):
+    """
+    Consecutive identical messages are shown once in the report, with their count.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            for i in range(1000):
+                qt_api.qWarning('repeated message')
+            qt_api.qWarning('another message')
+            qt_api.qWarning('repeated message')
+            assert 0
+        """)
+    res = testdir.runpytest()
+    res.stdout.fnmatch_lines(
+        [
+            "*Captured Qt messages*",
+            "*QtWarningMsg: repeated message (x1000)",
+            "*QtWarningMsg: another message",
+            "*QtWarningMsg: repeated message",
+            "*1 failed*",
+        ]
+    )
+
+
+def test_logging_report_max_messages(testdir):
+    """
+    Test qt_log_report_max_messages ini option.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_report_max_messages = 3
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1():
+            for i in range(10):
+                qt_api.qWarning(f'message {i}')
+            assert 0
+        """)
+    res = testdir.runpytest()
+    res.stdout.fnmatch_lines(
+        [
+            "*Captured Qt messages*",
+            "*QtWarningMsg: message 0",
+            "... 7 messages omitted ...",
+            "*QtWarningMsg: message 8",
+            "*QtWarningMsg: message 9",
+            "*1 failed*",
+        ]
+    )
+    res.stdout.no_fnmatch_line("*QtWarningMsg: message 1")
+
+
+def test_qtlog_messages_from_threads(qtlog):
+    """
+    Messages emitted by other threads are buffered, and stored in the order
+    they were emitted when the records are accessed.
+    """
+    import threading
+
+    def emit(name):
+        for i in range(100):
+            qt_api.qWarning(f"{name} {i}")
+
+    threads = [threading.Thread(target=emit, args=(f"t{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert qtlog._records == []
+
+    emit("main")
+    records = qtlog.records
+    assert len(records) == 500
+    timestamps = [rec.timestamp_ns for rec in records]
+    assert timestamps == sorted(timestamps)
+    assert records[-1].message == "main 99"
+    for name in ["main", "t0", "t1", "t2", "t3"]:
+        messages = [rec.message for rec in records if rec.message.split()[0] == name]
+        assert messages == [f"{name} {i}" for i in range(100)]
+
+
+def test_qtlog_thread_buffers_flushed_by_main_thread(qtlog):
+    """
+    A message handled directly in another thread, because a message is waited
+    for, doesn't flush the messages buffered by the other threads: only the
+    main thread does.
+    """
+    import re
+    import threading
+
+    from pytestqt.wait_signal import CallbackBlocker
+
+    buffered = threading.Event()
+    done = threading.Event()
+
+    def emit_buffered():
+        qt_api.qWarning("buffered")
+        buffered.set()
+        # kept alive so the other thread doesn't get the same identifier
+        done.wait()
+
+    thread = threading.Thread(target=emit_buffered)
+    thread.start()
+    try:
+        buffered.wait()
+        assert qtlog._thread_buffers_pending
+
+        blocker = CallbackBlocker(timeout=0, raising=False)
+        qtlog._message_waiters.append((re.compile("direct"), blocker))
+        try:
+            direct_thread = threading.Thread(target=qt_api.qWarning, args=("direct",))
+            direct_thread.start()
+            direct_thread.join()
+        finally:
+            qtlog._message_waiters.clear()
+    finally:
+        done.set()
+        thread.join()
+    assert blocker.called
+    assert [rec.message for rec in qtlog._records] == ["direct"]
+    assert qtlog._thread_buffers_pending
+
+    assert [rec.message for rec in qtlog.records] == ["direct", "buffered"]
+    assert not qtlog._thread_buffers_pending
+
+
+@pytest.mark.qt_log_level_fail("WARNING")
+@pytest.mark.qt_log_ignore("second")
+def test_qtlog_thread_direct_message_order(qtlog):
+    """
+    A message of another thread handled directly, because it makes the test
+    fail, is stored after the messages buffered earlier by the same thread.
+    """
+    import threading
+
+    def emit():
+        qt_api.qDebug("first")
+        qt_api.qWarning("second")
+
+    thread = threading.Thread(target=emit)
+    thread.start()
+    thread.join()
+    assert [rec.message for rec in qtlog.records] == ["first", "second"]
+
+
 @pytest.mark.parametrize("arg", ["--no-qt-log", "--capture=no", "-s"])
 def test_fixture_with_logging_disabled(testdir, arg):
     """
@@ -243,6 +809,94 @@ def test_logging_fails_tests_mark(testdir):
     res.assertoutcome(failed=1)
 
 
+@pytest.mark.parametrize("fail_fast", [False, True])
+def test_logging_fails_tests_mark_applied_by_fixture(testdir, fail_fast):
+    """
+    A qt_log_level_fail mark applied by a fixture overrides the ini file too.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini(f"""
+        [pytest]
+        qt_log_level_fail = WARNING
+        qt_log_fail_fast = {fail_fast}
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+        import pytest
+
+        @pytest.fixture
+        def critical_only(request):
+            request.applymarker(pytest.mark.qt_log_level_fail("CRITICAL"))
+
+        def test_1(critical_only):
+            qt_api.qWarning('message')
+        """)
+    res = testdir.inline_run()
+    res.assertoutcome(passed=1)
+
+
+@pytest.mark.parametrize("mode", ["ini", "mark"])
+def test_logging_fail_fast(testdir, mode):
+    """
+    With qt_log_fail_fast, a message at or above qt_log_level_fail aborts the
+    wait in progress instead of letting it time out.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    ini = "qt_log_fail_fast = true" if mode == "ini" else ""
+    mark = "@pytest.mark.qt_log_fail_fast" if mode == "mark" else ""
+    testdir.makeini(f"""
+        [pytest]
+        qt_log_level_fail = WARNING
+        {ini}
+        """)
+    testdir.makepyfile(f"""
+        from pytestqt.qt_compat import qt_api
+        import pytest
+
+        {mark}
+        def test_1(qtbot):
+            obj = qt_api.QtCore.QObject()
+            qt_api.QtCore.QTimer.singleShot(0, lambda: qt_api.qWarning('boom'))
+            with qtbot.waitSignal(obj.destroyed, timeout=60000):
+                pass
+        """)
+    res = testdir.runpytest()
+    res.stdout.fnmatch_lines(
+        [
+            "*Failure: Qt messages with level WARNING or above emitted*",
+            "*QtWarningMsg: boom*",
+            "*1 failed*",
+        ]
+    )
+    res.stdout.no_fnmatch_line("*TimeoutError*")
+
+
+def test_logging_fail_fast_ignored(testdir):
+    """
+    Ignored messages and messages below qt_log_level_fail don't abort waits.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makeini("""
+        [pytest]
+        qt_log_level_fail = WARNING
+        qt_log_fail_fast = true
+        qt_log_ignore = ignored.*
+        """)
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        def test_1(qtbot):
+            qt_api.qWarning('ignored message')
+            qt_api.qDebug('debug message')
+            qtbot.wait(10)
+        """)
+    res = testdir.inline_run()
+    res.assertoutcome(passed=1)
+
+
 def test_logging_fails_ignore(testdir):
     """
     Test qt_log_ignore config option.
@@ -295,6 +949,43 @@ def test_logging_fails_ignore(testdir):
     res.stdout.fnmatch_lines(lines)
 
 
+@pytest.mark.parametrize(
+    "message, ignored",
+    [
+        ("WM_DESTROY was sent", True),
+        ("wm_paint NOT handled", True),
+        ("repeat-repeat", True),
+        ("repeat-other", False),
+        ("a critical message", False),
+    ],
+)
+def test_compile_ignore_regexes(message, ignored):
+    """
+    The ignore regexes are merged into a single regex where possible, but still
+    support global inline flags and backreferences.
+    """
+    from pytestqt.logging import _compile_ignore_regexes
+
+    regexes = ("WM_DESTROY.*sent", "(?i)WM_PAINT not handled", r"(\w+)-\1")
+    is_ignored = _compile_ignore_regexes(regexes)
+    assert is_ignored(message) == ignored
+    assert _compile_ignore_regexes(regexes) is is_ignored
+    assert not _compile_ignore_regexes(())(message)
+
+
+def test_compile_ignore_regexes_conditional_group():
+    """
+    Patterns with conditional group references are not merged, as merging would
+    renumber their groups.
+    """
+    from pytestqt.logging import _compile_ignore_regexes
+
+    is_ignored = _compile_ignore_regexes(("(first)-x", "(a)?(?(1)b|c)d"))
+    assert is_ignored("abd")
+    assert is_ignored("cd")
+    assert not is_ignored("ad")
+
+
 @pytest.mark.parametrize("message", ["match-global", "match-mark"])
 @pytest.mark.parametrize("marker_args", ["'match-mark', extend=True", "'match-mark'"])
 def test_logging_mark_with_extend(testdir, message, marker_args):
@@ -27,7 +27,9 @@ def _format_pep_8(camel_case_name: str) -> str:
         ("wait_signal", "waitSignal"),
         ("wait_signals", "waitSignals"),
         ("assert_not_emitted", "assertNotEmitted"),
+        ("record_signals", "recordSignals"),
         ("wait_until", "waitUntil"),
+        ("wait_property", "waitProperty"),
         ("wait_callback", "waitCallback"),
     ],
 )
@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+
+def test_resource_report(testdir):
+    """
+    Test --qt-resource-report option.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        from pytestqt.qt_compat import qt_api
+
+        # created before the first snapshot, so it is not counted as growth
+        app = qt_api.QtWidgets.QApplication.instance() or qt_api.QtWidgets.QApplication([])
+        leaked = []
+
+        def test_leak(qtbot):
+            for i in range(10):
+                leaked.append(qt_api.QtCore.QTimer())
+            leaked.append(qt_api.QtWidgets.QWidget())
+
+        def test_no_leak(qtbot):
+            qt_api.QtCore.QTimer()
+        """)
+    res = testdir.runpytest("--qt-resource-report=1")
+    res.stdout.fnmatch_lines(
+        [
+            "*= Qt resource report =*",
+            "session: *objects*QObjects +11, top-level widgets +1*",
+            "top 1 tests by growth:",
+            "test_resource_report.py::test_leak: *QObjects +11, top-level widgets +1*",
+            "    QObjects: QTimer +10, QWidget +1",
+            "*2 passed*",
+        ]
+    )
+    res.stdout.no_fnmatch_line("test_resource_report.py::test_no_leak*")
+
+
+@pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="rss and fds are only read on Linux"
+)
+def test_resource_report_fds(testdir):
+    """
+    Test that open file descriptors are reported.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        import os
+
+        leaked = []
+
+        def test_leak():
+            leaked.append(os.open(os.devnull, os.O_RDONLY))
+        """)
+    res = testdir.runpytest("--qt-resource-report=1")
+    res.stdout.fnmatch_lines(
+        ["test_resource_report_fds.py::test_leak: rss *, fds +1", "*1 passed*"]
+    )
+
+
+def test_resource_report_tracemalloc(testdir):
+    """
+    Test --qt-resource-tracemalloc option.
+
+    :type testdir: _pytest.pytester.TmpTestdir
+    """
+    testdir.makepyfile("""
+        leaked = []
+
+        def test_leak():
+            leaked.append(bytearray(10 * 1024 * 1024))
+        """)
+    res = testdir.runpytest("--qt-resource-report=1", "--qt-resource-tracemalloc")
+    res.stdout.fnmatch_lines(
+        [
+            "test_resource_report_tracemalloc.py::test_leak: *",
+            "    *test_resource_report_tracemalloc.py:4: size=10.0 MiB*",
+            "*1 passed*",
+        ]
+    )
+
+
+def test_resource_report_disabled(testdir):
+    testdir.makepyfile("""
+        def test_1():
+            pass
+        """)
+    res = testdir.runpytest()
+    res.stdout.no_fnmatch_line("*Qt resource report*")
@@ -359,6 +359,52 @@ def test_wait_twice(qtbot, timer, multiple, do_timeout, signaller):
             signaller.signal.emit()
 
 
+def test_event_loops_reused(qtbot, signaller, timer):
+    """Blockers reuse pooled event loops, and only use one when actually waiting."""
+    from pytestqt.wait_signal import _event_loop_pool
+
+    with qtbot.waitSignal(signaller.signal) as blocker:
+        signaller.signal.emit()
+    assert blocker._loop is None
+
+    qtbot.wait(10)
+    free_loops = list(_event_loop_pool._free_loops)
+    assert free_loops
+
+    with qtbot.waitSignal(signaller.signal, timeout=1000):
+        timer.single_shot(signaller.signal, 10)
+    with qtbot.waitCallback(timeout=1000) as callback:
+        timer.single_shot_callback(callback, 10)
+    assert _event_loop_pool._free_loops == free_loops
+
+
+@pytest.mark.parametrize("order", ["none", "simple", "strict"])
+def test_wait_signals_many_emissions(qtbot, signaller, order):
+    """
+    Waiting for a large number of (repeated) signals, which are matched without
+    scanning all expected signals on every emission.
+    """
+    count = 20_000
+    signals = [signaller.signal, signaller.signal_2] * count
+    with qtbot.waitSignals(signals, order=order, timeout=1000) as blocker:
+        for _ in range(count):
+            signaller.signal.emit()
+            signaller.signal_2.emit()
+    assert blocker.signal_triggered
+
+
+def test_wait_signals_many_emissions_callbacks(qtbot, signaller):
+    count = 1000
+    signals = [signaller.signal_single_arg] * count
+    callbacks = [functools.partial(lambda i, arg: arg == i, i) for i in range(count)]
+    with qtbot.waitSignals(
+        signals, check_params_cbs=callbacks, timeout=1000
+    ) as blocker:
+        for i in reversed(range(count)):
+            signaller.signal_single_arg.emit(i)
+    assert blocker.signal_triggered
+
+
 def test_wait_signals_invalid_strict_parameter(qtbot, signaller):
     with pytest.raises(ValueError):
         qtbot.waitSignals([signaller.signal], order="invalid")
@@ -1297,6 +1343,34 @@ class TestAssertNotEmitted:
         stop_watch.check(4000)
 
 
+@pytest.mark.parametrize("multiple", [False, True])
+def test_aborted_wait_disconnects(qtbot, signaller, multiple):
+    """
+    A wait aborted by a failure (see _abort_waits) disconnects from its signals,
+    as a wait which times out does.
+    """
+    from pytestqt.wait_signal import _abort_waits
+
+    def fail():
+        raise RuntimeError("aborted")
+
+    def receivers():
+        if qt_api.is_pyside:
+            return signaller.receivers(qt_api.QtCore.SIGNAL("signal()"))
+        return signaller.receivers(signaller.signal)
+
+    before = receivers()
+    qt_api.QtCore.QTimer.singleShot(10, lambda: _abort_waits(fail))
+    if multiple:
+        blocker = qtbot.waitSignals([signaller.signal], timeout=5000)
+    else:
+        blocker = qtbot.waitSignal(signaller.signal, timeout=5000)
+    with pytest.raises(RuntimeError, match="aborted"):
+        with blocker:
+            pass
+    assert receivers() == before
+
+
 class TestWaitCallback:
     def test_immediate(self, qtbot):
         with qtbot.waitCallback() as callback:
@@ -1481,3 +1555,111 @@ def test_callback_in_thread(pytester: pytest.Pytester) -> None:
     res = pytester.runpytest_subprocess("-x")
     outcomes = res.parseoutcomes()
     res.assert_outcomes(passed=outcomes["passed"])  # no failed/error
+
+
+class TestHistory:
+    """
+    Tests the ``history`` parameter, which bounds the signal history kept by blockers.
+    """
+
+    def test_wait_signals_history(self, qtbot, signaller):
+        signals = [(signaller.signal_args, "signal_args")] * 10
+        with qtbot.waitSignals(signals, history=3) as blocker:
+            for i in range(10):
+                signaller.signal_args.emit("x" * 1000, i)
+
+        assert len(blocker.all_signals_and_args) == 3
+        last = blocker.all_signals_and_args[-1]
+        assert last.signal_name == "signal_args"
+        assert last.args[1] == "9"
+        assert len(last.args[0]) < 100
+        assert str(last).startswith("signal_args('xxx")
+
+    def test_wait_signal_history(self, qtbot, signaller):
+        with qtbot.waitSignal(
+            signaller.signal_single_arg,
+            check_params_cb=lambda value: value == 4,
+            history=2,
+        ) as blocker:
+            for i in range(5):
+                signaller.signal_single_arg.emit(i)
+
+        assert list(blocker.all_args) == [("3",), ("4",)]
+        assert blocker.args == [4]
+
+    def test_timeout_message(self, qtbot, signaller):
+        with pytest.raises(TimeoutError) as excinfo:
+            with qtbot.waitSignals(
+                [(signaller.signal_args, "signal_args")] * 3, timeout=100, history=1
+            ):
+                signaller.signal_args.emit("a", 1)
+                signaller.signal_args.emit("b", 2)
+
+        assert str(excinfo.value) == (
+            "Emitted signals: [signal_args('b', 2)]. Missing: [signal_args]"
+        )
+
+    def test_message_not_built_on_success(self, qtbot, signaller, monkeypatch):
+        def fail():
+            raise AssertionError("should not be called")
+
+        with qtbot.waitSignals([signaller.signal]) as blocker:
+            monkeypatch.setattr(blocker, "_get_timeout_error_message", fail)
+            signaller.signal.emit()
+        assert blocker.signal_triggered
+
+
+class TestRecordSignals:
+    def test_counts_and_args(self, qtbot, signaller):
+        with qtbot.recordSignals(signaller.signal, signaller.signal_args) as recorder:
+            for i in range(100):
+                signaller.signal_args.emit("a", i)
+            signaller.signal.emit()
+
+        assert len(recorder) == 2
+        assert recorder[signaller.signal].count == 1
+        assert recorder[signaller.signal_args].count == 100
+        assert recorder[1] is recorder[signaller.signal_args]
+        assert recorder[signaller.signal_args].args(0) == ["a", 0]
+        assert recorder[signaller.signal_args].args(-1) == ["a", 99]
+        with pytest.raises(IndexError):
+            recorder[signaller.signal].args(1)
+        assert recorder[signaller.signal].timestamps is None
+        with pytest.raises(ValueError):
+            recorder[signaller.signal].intervals()
+
+    def test_not_recording_after_exit(self, qtbot, signaller):
+        with qtbot.recordSignals(signaller.signal) as recorder:
+            signaller.signal.emit()
+        signaller.signal.emit()
+        assert recorder[signaller.signal].count == 1
+
+    def test_spy_released_after_exit(self, qtbot, signaller):
+        with qtbot.recordSignals(signaller.signal_args) as recorder:
+            signaller.signal_args.emit("a", 1)
+        recording = recorder[signaller.signal_args]
+        assert recording._spy is None
+        for i in range(1000):
+            signaller.signal_args.emit("b", i)
+        assert recording.count == 1
+        assert recording.args(0) == ["a", 1]
+
+    def test_unknown_signal(self, qtbot, signaller):
+        with qtbot.recordSignals(signaller.signal) as recorder:
+            pass
+        with pytest.raises(KeyError):
+            recorder[signaller.signal_2]
+
+    def test_timestamps_and_rate(self, qtbot, signaller, timer):
+        with qtbot.recordSignals(signaller.signal, timestamps=True) as recorder:
+            timer.single_shot(signaller.signal, 0)
+            timer.single_shot(signaller.signal, 100)
+            qtbot.wait(200)
+
+        recording = recorder[signaller.signal]
+        assert recording.count == 2
+        assert len(recording.timestamps) == 2
+        (interval,) = recording.intervals()
+        assert 50 < interval < 1000
+        assert recorder.duration > 0.1
+        assert recorder.rate(signaller.signal) == pytest.approx(2 / recorder.duration)
@@ -64,3 +64,79 @@ def tick_counter():
     counter = Counter()
     yield counter
     counter.timer.stop()
+
+
+def test_wait_until_signals(qtbot, timer, tick_counter):
+    """
+    With signals given, the callback is only called again when a signal is emitted
+    (plus the slow fallback poll), not every 10 ms.
+    """
+    calls = []
+
+    def callback():
+        calls.append(tick_counter.ticks)
+        return tick_counter.ticks >= 4
+
+    tick_counter.start(50)
+    qtbot.waitUntil(callback, timeout=1000, signals=[tick_counter.timer.timeout])
+    assert tick_counter.ticks >= 4
+    assert len(calls) <= 10
+
+
+def test_wait_until_signals_timeout(qtbot, tick_counter):
+    tick_counter.start(500)
+    with pytest.raises(qtbot.TimeoutError):
+        qtbot.waitUntil(
+            lambda: tick_counter.ticks >= 4,
+            timeout=250,
+            signals=[tick_counter.timer.timeout],
+        )
+
+
+def test_wait_until_signals_fallback_poll(qtbot, timer):
+    """The callback is checked periodically even if no signal is emitted."""
+    from pytestqt.qt_compat import qt_api
+
+    class Signaller(qt_api.QtCore.QObject):
+        signal = qt_api.Signal()
+
+    signaller = Signaller()
+    values = []
+    timer.single_shot_callback(lambda: values.append(1), 50)
+    qtbot.waitUntil(lambda: bool(values), timeout=1000, signals=[signaller.signal])
+
+
+def test_wait_property(qtbot, timer):
+    from pytestqt.qt_compat import qt_api
+
+    spinbox = qt_api.QtWidgets.QSpinBox()
+    qtbot.addWidget(spinbox)
+    timer.single_shot_callback(lambda: spinbox.setValue(42), 50)
+    qtbot.waitProperty(spinbox, "value", 42, timeout=1000)
+    assert spinbox.value() == 42
+
+
+def test_wait_property_timeout(qtbot):
+    from pytestqt.qt_compat import qt_api
+
+    spinbox = qt_api.QtWidgets.QSpinBox()
+    qtbot.addWidget(spinbox)
+    with pytest.raises(qtbot.TimeoutError):
+        qtbot.waitProperty(spinbox, "value", 42, timeout=100)
+
+
+def test_wait_property_dynamic(qtbot, timer):
+    from pytestqt.qt_compat import qt_api
+
+    obj = qt_api.QtCore.QObject()
+    obj.setProperty("state", "loading")
+    timer.single_shot_callback(lambda: obj.setProperty("state", "done"), 50)
+    qtbot.waitProperty(obj, "state", "done", timeout=1000)
+
+
+def test_wait_property_unknown(qtbot):
+    from pytestqt.qt_compat import qt_api
+
+    obj = qt_api.QtCore.QObject()
+    with pytest.raises(ValueError, match="has no property named 'foo'"):
+        qtbot.waitProperty(obj, "foo", 1)